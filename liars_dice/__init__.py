@@ -0,0 +1,14 @@
+"""
+Terminal Liar's Dice.
+
+    engine       rules, probabilities, partners, payouts, match events (no other imports)
+    ai           opponent model, difficulty parameters, policies, table talk
+    persistence  AI memory, gold ledger, match checkpoints and their event subscribers
+    simulate     headless matches, self-play tuning, analytics
+    ui           the interactive game and menus
+    broadcast    streaming a running match to local viewers
+    cli          command line entry point
+
+Import the module you need; importing the package itself loads nothing else, so
+simulation workers and servers never pull in the terminal UI.
+"""
@@ -0,0 +1,572 @@
+"""
+AI players: opponent modelling, tunable difficulty parameters, decision policies and table talk.
+"""
+import random
+import time
+import os
+import json
+from array import array
+from collections import OrderedDict
+
+from .engine import (BASE_STATS, SPOT_ON, DEFAULT_RULES, RoundHands, prob_tail, prob_exact, _ensure_ai, _face_p,
+                     all_partner_dice)
+from .term import Print
+
+# =========================
+# Opponent model
+# =========================
+OPP_MODEL_CAPACITY = 512
+OPP_MODEL_DECAY = 0.15
+
+# slot layout: bluff rate, defend success rate, bluff success rate
+_OPP_BLUFF, _OPP_DEFEND, _OPP_BLUFF_SUCCESS = 0, 1, 2
+_OPP_FIELDS = 3
+
+class OpponentModel:
+    """
+    Exponentially decayed read on each opponent, kept per (observer, opponent).
+
+    Rates live in one flat array of doubles with a fixed slot per pair, so the
+    footprint never grows past `capacity` pairs; the least recently seen pair is
+    evicted when a new one needs a slot. A pair starts from the lifetime ratios
+    in global memory and then drifts towards recent behaviour at `decay` per
+    observation.
+    """
+    __slots__ = ("capacity", "decay", "_rates", "_slots", "_free")
+
+    def __init__(self, capacity=OPP_MODEL_CAPACITY, decay=OPP_MODEL_DECAY):
+        self.capacity = max(1, int(capacity))
+        self.decay = float(decay)
+        self._rates = array("d", bytes(8 * _OPP_FIELDS * self.capacity))
+        self._slots = OrderedDict()
+        self._free = list(range(self.capacity - 1, -1, -1))
+
+    def __len__(self):
+        return len(self._slots)
+
+    def _slot(self, observer, opponent, global_memory):
+        key = (observer, opponent)
+        slot = self._slots.get(key)
+        if slot is not None:
+            self._slots.move_to_end(key)
+            return slot
+        if self._free:
+            slot = self._free.pop()
+        else:
+            _, slot = self._slots.popitem(last=False)
+        self._slots[key] = slot
+
+        # seed from lifetime stats, same ratios the AI used before this model existed
+        if global_memory is not None:
+            _ensure_ai(global_memory, opponent)
+            opp = global_memory[opponent]
+        else:
+            opp = BASE_STATS
+        base = slot * _OPP_FIELDS
+        self._rates[base + _OPP_BLUFF] = (opp["bluffs_made"] /
+                                          max(1, opp["truths_made"] + opp["bluffs_made"]))
+        self._rates[base + _OPP_DEFEND] = (opp["defended_success"] /
+                                           max(1, opp["defended_success"] + opp["bluffs_caught"]))
+        self._rates[base + _OPP_BLUFF_SUCCESS] = (opp["bluff_success"] / max(1, opp["bluffs_made"]))
+        return slot
+
+    def rates(self, observer, opponent, global_memory=None):
+        """Returns (bluff_rate, defend_success_rate, bluff_success_rate)."""
+        base = self._slot(observer, opponent, global_memory) * _OPP_FIELDS
+        r = self._rates
+        return r[base + _OPP_BLUFF], r[base + _OPP_DEFEND], r[base + _OPP_BLUFF_SUCCESS]
+
+    def observe(self, observer, opponent, global_memory=None, bluffed=None, defended=None, bluff_succeeded=None):
+        """Folds one outcome into the pair's rates; fields left as None are untouched."""
+        base = self._slot(observer, opponent, global_memory) * _OPP_FIELDS
+        r = self._rates
+        a = self.decay
+        for field, outcome in ((_OPP_BLUFF, bluffed), (_OPP_DEFEND, defended), (_OPP_BLUFF_SUCCESS, bluff_succeeded)):
+            if outcome is not None:
+                r[base + field] += a * ((1.0 if outcome else 0.0) - r[base + field])
+
+_shared_opponent_model = None
+
+def shared_opponent_model():
+    """
+    The OpponentModel every interactive match in this process plays with, so the
+    decayed reads carry over from one match to the next instead of restarting
+    from lifetime ratios each time.
+    """
+    global _shared_opponent_model
+    if _shared_opponent_model is None:
+        _shared_opponent_model = OpponentModel()
+    return _shared_opponent_model
+
+# =========================
+# Dialogue templates
+# =========================
+table_talk = {
+    "pre_bid": [
+        "[{name}] Hmm... let’s start with this...",
+        "[{name}] Starting strong with {next_qty} {face}'s.",
+        "[{name}] Don’t get too confident {target}.",
+        "[{name}] Haha, good luck guys.",
+        "[{name}] Let's start off slowly.",
+        "[{name}] Well this is interesting...",
+        "[{name}] I've already won this game.",
+        "[{name}] Let’s get this started.",
+        "[{name}] Careful, {target}. I’m watching you.",
+        "[{name}] I can feel the tension in the air."
+    ],
+    "raise": [
+        "[{name}] Let's go with {new_qty} {new_face}'s.",
+        "[{name}] Aww scared are we?. {new_qty} {new_face}'s.",
+        "[{name}] Haha, Try this, {new_qty} {new_face}'s.",
+        "[{name}] Watch and learn... {new_qty} {new_face}'s.",
+        "[{name}] Can you top that? {new_qty} {new_face}'s.",
+        "[{name}] I raise it to {new_qty} {new_face}'s.",
+        "[{name}] {new_qty} {new_face}'s.",
+        "[{name}] Let’s see how you guys handle {new_qty} {new_face}'s.",
+        "[{name}] This is the last truthful bid. {new_qty} {new_face}'s."
+    ],
+    "call_bluff": [
+        "[{name}] Haha, thats a bluff",
+        "[{name}] Bluff! No way that’s true.",
+        "[{name}] I don’t buy it.",
+        "[{name}] Let’s see what you’re hiding.",
+        "[{name}] I’m calling you out!",
+        "[{name}] You sure about that one?",
+        "[{name}] Not convinced.",
+        "[{name}] Let’s check those dice.",
+        "[{name}] I think you’re fibbing.",
+        "[{name}] Even you know that bid was too high."
+    ]
+}
+
+# =========================
+# AI parameters
+# =========================
+AI_PROFILE_FILE = "ai_profile.json"
+
+# Every tunable constant the AI uses, resolved per difficulty. "*_chance" values of
+# 1.0 mean "always" and never draw from the RNG, matching the hard-coded branches
+# these replaced.
+AI_PARAMS = {
+    "easy": {
+        "conf_low": 0.28, "conf_high": 0.45,
+        "open_partner_chance": 0.35, "open_confidence_weight": 0.25,
+        "call_partner_chance": 0.35,
+        "base_call_chance": 0.06, "bluff_margin_weight": 0.10, "p_false_weight": 0.40,
+        "quarter_weight": 0.12, "high_qty_base": 0.08, "high_qty_step": 0.02,
+        "call_scale": 0.75,
+        "opp_bluff_weight": 0.5, "opp_defend_weight": 0.3, "opp_bluff_success_weight": 0.15,
+        "partner_call_discount": 0.95, "endgame_multiplier": 1.6,
+        "raise_defend_weight": 0.25, "raise_bluff_weight": 0.20,
+        "spot_on_threshold": 0.50,
+    },
+    "medium": {
+        "conf_low": 0.50, "conf_high": 0.65,
+        "open_partner_chance": 0.6, "open_confidence_weight": 0.25,
+        "call_partner_chance": 0.75,
+        "base_call_chance": 0.06, "bluff_margin_weight": 0.10, "p_false_weight": 0.40,
+        "quarter_weight": 0.12, "high_qty_base": 0.08, "high_qty_step": 0.02,
+        "call_scale": 1.0,
+        "opp_bluff_weight": 0.5, "opp_defend_weight": 0.3, "opp_bluff_success_weight": 0.15,
+        "partner_call_discount": 0.85, "endgame_multiplier": 1.6,
+        "raise_defend_weight": 0.25, "raise_bluff_weight": 0.20,
+        "spot_on_threshold": 0.42,
+    },
+    "hard": {
+        "conf_low": 0.85, "conf_high": 0.95,
+        "open_partner_chance": 1.0, "open_confidence_weight": 0.4,
+        "call_partner_chance": 1.0,
+        "base_call_chance": 0.06, "bluff_margin_weight": 0.10, "p_false_weight": 0.60,
+        "quarter_weight": 0.12, "high_qty_base": 0.08, "high_qty_step": 0.02,
+        "call_scale": 0.85,
+        "opp_bluff_weight": 0.8, "opp_defend_weight": 0.5, "opp_bluff_success_weight": 0.15,
+        "partner_call_discount": 0.8, "endgame_multiplier": 1.6,
+        "raise_defend_weight": 0.45, "raise_bluff_weight": 0.30,
+        "spot_on_threshold": 0.36,
+    },
+}
+
+# search range for each parameter when tuning
+AI_PARAM_BOUNDS = {
+    "conf_low": (0.1, 0.95), "conf_high": (0.2, 1.05),
+    "open_partner_chance": (0.0, 1.0), "open_confidence_weight": (0.0, 0.8),
+    "call_partner_chance": (0.0, 1.0),
+    "base_call_chance": (0.0, 0.3), "bluff_margin_weight": (0.0, 0.3), "p_false_weight": (0.0, 1.0),
+    "quarter_weight": (0.0, 0.3), "high_qty_base": (0.0, 0.2), "high_qty_step": (0.0, 0.1),
+    "call_scale": (0.3, 1.5),
+    "opp_bluff_weight": (0.0, 1.2), "opp_defend_weight": (0.0, 1.0), "opp_bluff_success_weight": (0.0, 0.5),
+    "partner_call_discount": (0.3, 1.0), "endgame_multiplier": (0.8, 2.5),
+    "raise_defend_weight": (0.0, 0.8), "raise_bluff_weight": (0.0, 0.6),
+    "spot_on_threshold": (0.15, 0.9),
+}
+
+def _read_ai_profile(path):
+    if not path or not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            raw = json.load(f)
+        return raw if isinstance(raw, dict) else {}
+    except Exception:
+        return {}
+
+def load_ai_profile(path=AI_PROFILE_FILE, raw=None):
+    """Returns AI_PARAMS overlaid with a saved profile, or the defaults if there is none."""
+    params = {d: dict(v) for d, v in AI_PARAMS.items()}
+    if raw is None:
+        raw = _read_ai_profile(path)
+    try:
+        for d, values in raw.get("params", {}).items():
+            if d not in params:
+                continue
+            for k, v in values.items():
+                if k in params[d]:
+                    params[d][k] = float(v)
+    except Exception:
+        params = {d: dict(v) for d, v in AI_PARAMS.items()}
+    return params
+
+def save_ai_profile(params, path=AI_PROFILE_FILE, meta=None, policies=None):
+    data = {"version": 1, "meta": meta or {}, "params": params}
+    if policies:
+        data["policy"] = policies
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+    except Exception:
+        pass
+
+# =========================
+# AI policies
+# =========================
+class TurnView:
+    """
+    What one AI can see when it is asked to act.
+
+    counts[f] / partner_counts[f] are how many of its own / its living partners'
+    dice count towards a bid on face f, best_face its most plentiful face and
+    partner_size how many dice its partners hold, all read from the round's
+    RoundHands. partner_dice (the partners' dice as one list) is built only if a
+    policy asks for it.
+    """
+    __slots__ = ("player", "dice", "total_dice", "players_left", "current_bid", "current_bidder", "partners",
+                 "global_memory", "opponent_model", "rng", "rules", "counts", "best_face", "partner_counts",
+                 "partner_size", "_active_players", "_partner_dice")
+
+    def __init__(self, player, hands, total_dice, players_left, current_bid,
+                 current_bidder, partners, global_memory, opponent_model=None, rng=random, rules=None):
+        self.player = player
+        self.dice = hands.active_players[player]
+        self.counts, self.best_face = hands.hand(player)
+        self.partner_counts, self.partner_size = hands.partner_counts(player)
+        self.total_dice = total_dice
+        self.players_left = players_left
+        self.current_bid = current_bid
+        self.current_bidder = current_bidder
+        self.partners = partners
+        self.global_memory = global_memory
+        self.opponent_model = opponent_model
+        self.rng = rng
+        self.rules = rules or DEFAULT_RULES
+        self._active_players = hands.active_players
+        self._partner_dice = None
+
+    @property
+    def partner_dice(self):
+        if self._partner_dice is None:
+            self._partner_dice = all_partner_dice(self.player, self.partners, self._active_players)
+        return self._partner_dice
+
+class HeuristicPolicy:
+    """
+    The stock AI: probability of the bid plus noisy estimation, opponent reads and
+    partner friendliness. One instance per difficulty, with that difficulty's
+    parameters bound as attributes when the match starts.
+
+    A policy answers two questions:
+      decide_opening(view)  -> (qty, face)
+      decide_response(view) -> None to call bluff, SPOT_ON (only when the rules
+                               allow it), or the (qty, face) raise
+    """
+    name = "heuristic"
+
+    def __init__(self, difficulty, params=None):
+        self.difficulty = difficulty
+        resolved = dict(AI_PARAMS.get(difficulty, AI_PARAMS["medium"]))
+        resolved.update(params or {})
+        for k, v in resolved.items():
+            setattr(self, k, v)
+
+    def _self_rates(self, view):
+        _ensure_ai(view.global_memory, view.player)
+        self_stats = view.global_memory[view.player]
+        defend_success_self = (self_stats["defended_success"] /
+                               max(1, self_stats["defended_success"] + self_stats["bluffs_caught"]))
+        bluff_success_self = (self_stats["bluff_success"] / max(1, self_stats["bluffs_made"]))
+        return defend_success_self, bluff_success_self
+
+    def decide_opening(self, view):
+        rng = view.rng
+        total_dice = view.total_dice
+        _, bluff_success_self = self._self_rates(view)
+
+        min_open = max(2, total_dice // 10)
+        face_guess = view.best_face if rng.random() < 0.7 else rng.randint(2, 5)
+
+        # Hard always considers partners, Medium often, Easy sometimes
+        base_qty = view.counts[face_guess]
+        chance = self.open_partner_chance
+        if chance >= 1.0 or (chance > 0.0 and rng.random() < chance):
+            base_qty += view.partner_counts[face_guess]
+
+        base_qty = max(min_open, base_qty)
+        confidence_factor = 1.0 + (bluff_success_self - 0.5) * self.open_confidence_weight
+        qty_guess = int(max(min_open, min(base_qty + rng.choice([0, 1]) * confidence_factor, total_dice)))
+        return qty_guess, face_guess
+
+    def decide_response(self, view):
+        rng = view.rng
+        total_dice = view.total_dice
+        total_players_left = view.players_left
+        player = view.player
+        defend_success_self, bluff_success_self = self._self_rates(view)
+        qty, face = view.current_bid
+
+        rules = view.rules
+        p_face = _face_p(face, rules)
+        have = view.counts[face]
+        partner_have = view.partner_counts[face]
+        known_count = have
+        # Hard always counts partners, Medium usually, Easy sometimes
+        chance = self.call_partner_chance
+        if chance >= 1.0 or (chance > 0.0 and rng.random() < chance):
+            known_count += partner_have
+
+        unknown_dice = total_dice - len(view.dice) - view.partner_size
+        need = max(0, qty - known_count)
+        p_true = prob_tail(need, unknown_dice, p_face)
+
+        # Spot on: claim the bid is exact when that is the likeliest single outcome
+        if rules["spot_on"] and qty >= known_count:
+            p_exact = prob_exact(qty - known_count, unknown_dice, p_face)
+            if p_exact >= self.spot_on_threshold and rng.random() < p_exact:
+                return SPOT_ON
+
+        estimate_factor = rng.uniform(self.conf_low, self.conf_high)
+        if total_players_left > 10:
+            estimate_factor = min(0.9, max(0.7, estimate_factor - 0.05))
+        if total_players_left <= 4:
+            estimate_factor = rng.uniform(0.9, 1.05)
+
+        estimated_total = known_count + int(unknown_dice * estimate_factor) + rng.randint(-1, 1)
+        bluff_margin = qty - estimated_total
+
+        call_chance = self.base_call_chance + max(0, bluff_margin) * self.bluff_margin_weight
+        call_chance += (1.0 - p_true) * self.p_false_weight
+
+        # Additional large-table sanity: if qty is well below expectation, be reluctant to call
+        expected = total_dice * p_face
+        variance = total_dice * p_face * (1 - p_face)
+        std = max(1.0, variance ** 0.5)
+        if total_dice >= 60:
+            if qty <= expected - 0.5 * std:
+                call_chance *= 0.25
+            elif qty <= expected:
+                call_chance *= 0.5
+
+        # Sanity floor
+        if qty <= max(2, total_dice // 4) and p_true > 0.60:
+            call_chance *= 0.10
+
+        threshold_quarter = max(3, (total_dice + 4) // 4)
+        if qty > threshold_quarter:
+            call_chance += self.quarter_weight * (qty - threshold_quarter)
+        if qty > 8:
+            call_chance += self.high_qty_base + (qty - 8) * self.high_qty_step
+
+        call_chance *= self.call_scale
+
+        bidder = view.current_bidder
+        if bidder:
+            global_memory = view.global_memory
+            if view.opponent_model is not None:
+                opp_bluff_rate, opp_defend_success_rate, opp_bluff_success_rate = \
+                    view.opponent_model.rates(player, bidder, global_memory)
+            else:
+                _ensure_ai(global_memory, bidder)
+                opp = global_memory[bidder]
+                opp_defend_success_rate = (opp["defended_success"] /
+                                           max(1, opp["defended_success"] + opp["bluffs_caught"]))
+                opp_bluff_rate = (opp["bluffs_made"] / max(1, opp["truths_made"] + opp["bluffs_made"]))
+                opp_bluff_success_rate = (opp["bluff_success"] / max(1, opp["bluffs_made"]))
+            call_chance *= (1.0 + (opp_bluff_rate - 0.5) * self.opp_bluff_weight)
+            call_chance *= (1.0 - (opp_defend_success_rate - 0.5) * self.opp_defend_weight)
+            call_chance *= (1.0 - (opp_bluff_success_rate - 0.5) * self.opp_bluff_success_weight)
+
+        # Partner friendliness: medium/hard 10–20% less likely to call partners
+        if bidder and bidder in view.partners.get(player, []):
+            call_chance *= self.partner_call_discount
+
+        if total_players_left <= 4:
+            call_chance *= self.endgame_multiplier
+
+        call_chance = max(0.02, min(call_chance, 0.95))
+
+        # Decision
+        if rng.random() < call_chance:
+            return None
+
+        total_have = have + partner_have
+        conservative = qty >= max(9, threshold_quarter)
+        confidence_factor = 1.0 + (defend_success_self - 0.5) * self.raise_defend_weight \
+                                + (bluff_success_self - 0.5) * self.raise_bluff_weight
+        if total_have >= 2 and not conservative:
+            inc_raw = rng.choice([1, 1, 2])
+        else:
+            inc_raw = 1 if conservative or rng.random() < 0.9 else 0
+        inc = max(1, int(round(inc_raw * confidence_factor)))
+        new_qty = min(qty + inc, total_dice)
+        face_bump_chance = 0.65 + (confidence_factor - 1.0) * 0.2
+        new_face = face if rng.random() < min(0.95, max(0.05, face_bump_chance)) else min(6, face + rng.choice([0, 1]))
+        return new_qty, new_face
+
+# policy name -> class taking (difficulty, params); profiles may also name "module:Class"
+AI_POLICIES = {
+    "heuristic": HeuristicPolicy,
+}
+
+def _policy_class(name):
+    if name in AI_POLICIES:
+        return AI_POLICIES[name]
+    if ":" in name:
+        import importlib
+        module_name, _, attr = name.partition(":")
+        return getattr(importlib.import_module(module_name), attr)
+    raise KeyError(name)
+
+def load_ai_policies(path=AI_PROFILE_FILE, params=None):
+    """
+    Builds one policy per difficulty from the profile file, falling back to the
+    heuristic policy for anything missing or unloadable. Call once per match.
+    """
+    raw = _read_ai_profile(path)
+    if params is None:
+        params = load_ai_profile(path, raw=raw)
+    names = raw.get("policy", {}) if isinstance(raw.get("policy"), dict) else {}
+    policies = {}
+    for d in AI_PARAMS:
+        try:
+            cls = _policy_class(str(names.get(d, "heuristic")))
+            policies[d] = cls(d, params.get(d))
+        except Exception:
+            policies[d] = HeuristicPolicy(d, params.get(d))
+    return policies
+
+# AI move calculation
+def ai_take_turn(
+    player,
+    active_players,
+    partners,
+    current_bid,
+    current_bidder,
+    global_memory,
+    difficulty,
+    noise_gate=True,
+    opponent_model=None,
+    params=None,
+    quiet=False,
+    rng=random,
+    policy=None,
+    total_dice=None,
+    rules=None,
+    hands=None
+):
+    """
+    Returns (bid, bidder, wants_reveal, caller). wants_reveal is True for a bluff
+    call and SPOT_ON (also truthy) for a spot-on call. hands is the round's
+    RoundHands; without it the table is counted for this turn alone.
+    """
+    if policy is None:
+        policy = HeuristicPolicy(difficulty, params)
+    if hands is None:
+        hands = RoundHands(active_players, partners, rules or DEFAULT_RULES)
+    view = TurnView(
+        player=player,
+        hands=hands,
+        total_dice=total_dice if total_dice is not None else sum(len(d) for d in active_players.values()),
+        players_left=len(active_players),
+        current_bid=current_bid,
+        current_bidder=current_bidder,
+        partners=partners,
+        global_memory=global_memory,
+        opponent_model=opponent_model,
+        rng=rng,
+        rules=rules,
+    )
+    return _ai_act(policy, view, quiet)
+
+def _ai_act(policy, view, quiet):
+    """One AI turn on a ready view; returns what ai_take_turn does."""
+    player = view.player
+    current_bid = view.current_bid
+    current_bidder = view.current_bidder
+    rng = view.rng
+
+    # pacing
+    if not quiet:
+        time.sleep(0.015 if view.players_left > 20 else 0.1)
+
+    # Opening bid
+    if not current_bid:
+        qty_guess, face_guess = policy.decide_opening(view)
+        # dialogue printing — never skip any AI dialogue (headless runs pass quiet)
+        if not quiet:
+            Print(f"\n{rng.choice(table_talk['pre_bid']).format(name=player, next_qty=qty_guess, face=face_guess, target='Knight')}")
+            Print(f"{player} opens with {qty_guess} {face_guess}'s.\n")
+        return (qty_guess, face_guess), player, False, None
+
+    # Call vs raise
+    raise_to = policy.decide_response(view)
+    if raise_to is None:
+        return current_bid, current_bidder, True, player
+    if raise_to == SPOT_ON:
+        return current_bid, current_bidder, SPOT_ON, player
+    new_qty, new_face = raise_to
+    if not quiet:
+        Print(f"\n{rng.choice(table_talk['raise']).format(name=player, new_qty=new_qty, new_face=new_face)}\n")
+    return (new_qty, new_face), player, False, None
+
+class RoundAI:
+    """
+    The AI turns of one round, for tables where AI seats act back to back. Each
+    seat's TurnView is built the first time it acts and reused for the rest of
+    the round (hands, dice total and seat count only change between rounds), so
+    a turn costs the policy's decision and little else. turn() returns exactly
+    what ai_take_turn would, draw for draw.
+    """
+    __slots__ = ("hands", "total_dice", "players_left", "partners", "global_memory", "opponent_model", "rng",
+                 "rules", "quiet", "_views")
+
+    def __init__(self, hands, total_dice, partners, global_memory, opponent_model=None, rng=random, rules=None,
+                 quiet=True):
+        self.hands = hands
+        self.total_dice = total_dice
+        self.players_left = len(hands.active_players)
+        self.partners = partners
+        self.global_memory = global_memory
+        self.opponent_model = opponent_model
+        self.rng = rng
+        self.rules = rules
+        self.quiet = quiet
+        self._views = {}
+
+    def turn(self, player, policy, current_bid, current_bidder):
+        view = self._views.get(player)
+        if view is None:
+            view = self._views[player] = TurnView(player, self.hands, self.total_dice, self.players_left,
+                                                  current_bid, current_bidder, self.partners, self.global_memory,
+                                                  self.opponent_model, self.rng, self.rules)
+        else:
+            view.current_bid = current_bid
+            view.current_bidder = current_bidder
+        return _ai_act(policy, view, self.quiet)
@@ -0,0 +1,239 @@
+"""
+Broadcast mode: one running match streamed to any number of local viewers.
+"""
+import json
+import selectors
+import socket
+import threading
+import time
+from collections import deque
+
+from .engine import MATCH_EVENTS
+
+BROADCAST_HOST = "127.0.0.1"
+BROADCAST_PORT = 5151
+# frames a viewer may fall behind by before its oldest ones are dropped; enough for
+# a paced match, not for one played at simulate speed (see Broadcaster)
+BROADCAST_BACKLOG = 4096
+
+def event_frame(ev):
+    """One event as a JSON line: {"type": <event name>, <fields>...}."""
+    data = {"type": type(ev).__name__}
+    data.update(ev._asdict())
+    return (json.dumps(data, separators=(",", ":"), default=list) + "\n").encode("utf-8")
+
+class _Viewer:
+    __slots__ = ("sock", "frames", "pending", "dropped")
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.frames = deque()
+        self.pending = None
+        self.dropped = 0
+
+class Broadcaster:
+    """
+    Streams match events to viewers connected over local TCP, one JSON line per event.
+
+    publish() runs on the game's thread: it serializes the event once and queues
+    the same bytes for every viewer, then returns. A selector thread does all the
+    socket writes without blocking, sending everything a viewer has queued in one
+    write. Each viewer's queue holds at most `backlog` frames. When a slow viewer
+    fills it, its oldest frames are dropped, so the table never waits for the
+    viewer.
+
+    Viewers do lose frames when a match runs at simulate speed (no delay between
+    rounds): the table then publishes tens of thousands of frames a second, faster
+    than a terminal can print them. stats() reports how many were dropped.
+    """
+    def __init__(self, host=BROADCAST_HOST, port=BROADCAST_PORT, backlog=BROADCAST_BACKLOG):
+        self.backlog = max(1, int(backlog))
+        self.frames = 0
+        self._viewers = {}
+        self._lock = threading.Lock()
+        self._sel = selectors.DefaultSelector()
+        self._listener = socket.create_server((host, port))
+        self._listener.setblocking(False)
+        self.address = self._listener.getsockname()
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self._sel.register(self._listener, selectors.EVENT_READ, "accept")
+        self._sel.register(self._wake_r, selectors.EVENT_READ, "wake")
+        self._asleep = False
+        self._closing = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def attach(self, bus):
+        """Subscribes publish() to every match event on `bus`; returns the handles for detach()."""
+        return [bus.subscribe(event_type, self.publish) for event_type in MATCH_EVENTS]
+
+    def publish(self, ev):
+        frame = event_frame(ev)
+        with self._lock:
+            self.frames += 1
+            for viewer in self._viewers.values():
+                if len(viewer.frames) >= self.backlog:
+                    viewer.frames.popleft()
+                    viewer.dropped += 1
+                viewer.frames.append(frame)
+            wake, self._asleep = self._asleep and bool(self._viewers), False
+        if wake:
+            try:
+                self._wake_w.send(b"\0")
+            except OSError:
+                pass  # a wake-up is already pending
+
+    def stats(self):
+        with self._lock:
+            return {"viewers": len(self._viewers), "frames": self.frames,
+                    "dropped": sum(v.dropped for v in self._viewers.values())}
+
+    def close(self, linger=1.0):
+        """Stops accepting viewers, gives queued frames up to `linger` seconds to go out, then hangs up."""
+        if self._closing is not None:
+            return
+        self._closing = time.monotonic() + linger
+        try:
+            self._wake_w.send(b"\0")
+        except OSError:
+            pass
+        self._thread.join(timeout=linger + 2)
+
+    def _done(self):
+        if self._closing is None:
+            return False
+        if time.monotonic() >= self._closing:
+            return True
+        with self._lock:
+            return not any(v.pending is not None or v.frames for v in self._viewers.values())
+
+    def _run(self):
+        try:
+            while not self._done():
+                # anything published from here on wakes the select below
+                with self._lock:
+                    self._asleep = True
+                self._watch_writable()
+                for key, mask in self._sel.select(timeout=1.0 if self._closing is None else 0.05):
+                    if key.data == "accept":
+                        self._accept()
+                    elif key.data == "wake":
+                        self._drain(self._wake_r)
+                    else:
+                        if mask & selectors.EVENT_READ and not self._drain(key.data.sock):
+                            self._drop(key.data)
+                        elif mask & selectors.EVENT_WRITE:
+                            self._flush(key.data)
+        finally:
+            for viewer in list(self._viewers.values()):
+                self._drop(viewer)
+            for sock in (self._listener, self._wake_r, self._wake_w):
+                sock.close()
+            self._sel.close()
+
+    def _accept(self):
+        try:
+            sock, _ = self._listener.accept()
+        except BlockingIOError:
+            return
+        sock.setblocking(False)
+        viewer = _Viewer(sock)
+        with self._lock:
+            self._viewers[sock.fileno()] = viewer
+        self._sel.register(sock, selectors.EVENT_READ, viewer)
+
+    def _watch_writable(self):
+        """Selects viewers for writing only while they have something queued."""
+        with self._lock:
+            viewers = list(self._viewers.values())
+        for viewer in viewers:
+            events = selectors.EVENT_READ
+            if viewer.pending is not None or viewer.frames:
+                events |= selectors.EVENT_WRITE
+            if self._sel.get_key(viewer.sock).events != events:
+                self._sel.modify(viewer.sock, events, viewer)
+
+    @staticmethod
+    def _drain(sock):
+        """Discards whatever is readable; False once the other end has hung up."""
+        try:
+            while True:
+                data = sock.recv(4096)
+                if not data:
+                    return False
+        except BlockingIOError:
+            return True
+        except OSError:
+            return False
+
+    def _flush(self, viewer):
+        """Writes queued frames until the socket would block; a partly sent batch is always finished first."""
+        try:
+            while True:
+                if viewer.pending is None:
+                    with self._lock:
+                        if not viewer.frames:
+                            return
+                        viewer.pending = memoryview(b"".join(viewer.frames))
+                        viewer.frames.clear()
+                sent = viewer.sock.send(viewer.pending)
+                if sent < len(viewer.pending):
+                    viewer.pending = viewer.pending[sent:]
+                    return
+                viewer.pending = None
+        except BlockingIOError:
+            pass
+        except OSError:
+            self._drop(viewer)
+
+    def _drop(self, viewer):
+        with self._lock:
+            self._viewers.pop(viewer.sock.fileno(), None)
+        try:
+            self._sel.unregister(viewer.sock)
+        except (KeyError, ValueError):
+            pass
+        viewer.sock.close()
+
+def render_frame(frame):
+    """A decoded broadcast frame as the text a viewer prints, or None for frames not shown."""
+    kind = frame.get("type")
+    if kind == "MatchStarted":
+        return f"=== New match: {len(frame['players'])} players, pot {frame['pot']} ==="
+    if kind == "RoundStarted":
+        return f"\n-- Round {frame['number']}: {frame['starter']} starts, {frame['total_dice']} dice in play --"
+    if kind == "BidMade":
+        return f"{frame['bidder']} bids {frame['qty']} {frame['face']}'s."
+    if kind == "ChallengeResolved":
+        call = "calls spot on" if frame["spot_on"] else "calls bluff"
+        lines = [f"{frame['caller']} {call} on {frame['bidder']}."]
+        lines += [f"  {name}: {dice}" for name, dice in frame["hands"].items()]
+        lines.append(f"The bid was {frame['qty']} {frame['face']}'s, there are {frame['actual']}.")
+        return "\n".join(lines)
+    if kind == "PlayerOut":
+        return f"{frame['name']} {frame['verdict']} and is OUT!"
+    if kind == "DieLost":
+        return f"{frame['name']} {frame['verdict']} and loses a die ({frame['dice_left']} left)."
+    if kind == "MatchEnded":
+        lines = [f"=== Match over. Survivors: {', '.join(frame['survivors'])} ==="]
+        lines += [f"  {name}: {gold} gold" for name, gold in (frame["payouts"] or {}).items()]
+        return "\n".join(lines)
+    return None
+
+def watch(host=BROADCAST_HOST, port=BROADCAST_PORT, out=print, retry=True):
+    """Connects to a broadcast and prints it until the broadcaster goes away."""
+    while True:
+        try:
+            sock = socket.create_connection((host, port))
+            break
+        except OSError:
+            if not retry:
+                raise
+            time.sleep(0.5)
+    with sock, sock.makefile("r", encoding="utf-8") as stream:
+        for line in stream:
+            text = render_frame(json.loads(line))
+            if text is not None:
+                out(text)
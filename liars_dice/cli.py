@@ -0,0 +1,203 @@
+"""
+Command line entry point: the standalone menu, and the tune / report / startup / broadcast / stress / memory tools.
+"""
+import os
+import sys
+import time
+import json
+
+# the script the standalone menu is launched from
+SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "liarsdice.py")
+
+# Cold start: launch the menu and quit, as a fresh session would
+STARTUP_TARGET_MS = 100
+
+def measure_startup(runs=15, target_ms=STARTUP_TARGET_MS, log=print):
+    """Times `python liarsdice.py` from launch to exit via [4] Quit; True if the median meets the target."""
+    import subprocess
+
+    def median_ms(cmd, stdin):
+        times = []
+        for _ in range(runs):
+            t0 = time.perf_counter()
+            subprocess.run(cmd, input=stdin, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            times.append((time.perf_counter() - t0) * 1000)
+        times.sort()
+        return times[len(times) // 2], times[-1]
+
+    bare, _ = median_ms([sys.executable, "-c", "pass"], b"")
+    med, worst = median_ms([sys.executable, SCRIPT], b"4\n")
+    log(f"interpreter alone: {bare:.1f} ms")
+    log(f"menu cold start:   {med:.1f} ms median, {worst:.1f} ms worst over {runs} runs (target {target_ms:.0f} ms)")
+    return med <= target_ms
+
+# Command line tools (no arguments starts the standalone menu)
+def run_command(argv):
+    import argparse
+    from .ai import AI_PROFILE_FILE
+
+    def non_negative(text):
+        value = int(text)
+        if value < 0:
+            raise argparse.ArgumentTypeError(f"must be 0 or more, got {value}")
+        return value
+
+    parser = argparse.ArgumentParser(prog="liarsdice.py", description="Liar's Dice tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    t = sub.add_parser("tune", help="tune AI difficulty constants with headless self-play")
+    t.add_argument("--generations", type=int, default=15)
+    t.add_argument("--population", type=int, default=8, help="mutants tried per generation")
+    t.add_argument("--matches", type=int, default=300, help="matches per candidate")
+    t.add_argument("--table-size", type=int, default=9)
+    t.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+    t.add_argument("--seed", type=int, default=0)
+    t.add_argument("--target", nargs=3, type=float, metavar=("EASY", "MEDIUM", "HARD"),
+                   help="share of survivors per difficulty")
+    t.add_argument("--out", default=AI_PROFILE_FILE)
+    t.add_argument("--dice", type=int, default=4, help="dice per player")
+    t.add_argument("--dice-loss", action="store_true", help="lose one die per challenge instead of the seat")
+    t.add_argument("--wild-ones", action="store_true")
+    t.add_argument("--spot-on", action="store_true", help="also tunes spot_on_threshold")
+
+    r = sub.add_parser("report", help="win rate and payout analytics over many matches")
+    r.add_argument("--input", help="read compact results (one JSON per line) instead of simulating")
+    r.add_argument("--save", help="also write the simulated results to this file")
+    r.add_argument("--matches", type=int, default=1000)
+    r.add_argument("--table-size", type=int, nargs="+", default=[9], help="sizes cycled across matches")
+    r.add_argument("--gold-bet", type=int, default=50)
+    r.add_argument("--workers", type=int, default=None)
+    r.add_argument("--seed", type=int, default=0)
+    r.add_argument("--dice", type=int, default=4, help="dice per player")
+    r.add_argument("--dice-loss", action="store_true", help="lose one die per challenge instead of the seat")
+    r.add_argument("--wild-ones", action="store_true")
+    r.add_argument("--spot-on", action="store_true")
+
+    st = sub.add_parser("startup", help="measure cold start time of the standalone menu")
+    st.add_argument("--runs", type=int, default=15)
+    st.add_argument("--target-ms", type=float, default=STARTUP_TARGET_MS)
+
+    b = sub.add_parser("broadcast", help="play AI-only matches and stream them to local viewers")
+    b.add_argument("--matches", type=int, default=1)
+    b.add_argument("--table-size", type=int, default=9)
+    b.add_argument("--port", type=int, default=None)
+    b.add_argument("--delay", type=float, default=1.0, help="seconds between rounds, so viewers can follow; at 0 slow viewers drop frames")
+    b.add_argument("--seed", type=int, default=None)
+    b.add_argument("--gold-bet", type=int, default=50)
+
+    sr = sub.add_parser("stress", help="time headless matches on huge synthetic tables")
+    sr.add_argument("--seats", type=int, nargs="+", default=None, help="table sizes, one fresh process each")
+    sr.add_argument("--seed", type=int, default=0)
+    sr.add_argument("--dice", type=int, default=4, help="dice per player")
+    sr.add_argument("--dice-loss", action="store_true", help="lose one die per challenge instead of the seat")
+    sr.add_argument("--wild-ones", action="store_true")
+    sr.add_argument("--spot-on", action="store_true")
+
+    m = sub.add_parser("memory", help="compact the AI memory file and report its size and load time")
+    m.add_argument("--file", default=None, help="memory file (default: the one matches use)")
+    m.add_argument("--retention-days", type=non_negative, default=None, help="drop identities unseen for this long")
+    m.add_argument("--max-identities", type=non_negative, default=None)
+    m.add_argument("--counter-cap", type=non_negative, default=None, help="halve an identity's counters past this")
+    m.add_argument("--dry-run", action="store_true", help="report without rewriting the file")
+
+    w = sub.add_parser("watch", help="watch a broadcast match")
+    w.add_argument("--host", default=None)
+    w.add_argument("--port", type=int, default=None)
+
+    args = parser.parse_args(argv)
+    if args.command in ("tune", "report"):
+        from .engine import make_rules
+        from .ai import _read_ai_profile, load_ai_profile, save_ai_profile
+        from .simulate import (DEFAULT_TARGET_SHARE, MatchStats, iter_saved_results, iter_simulated_results,
+                               tune_ai_params)
+
+    if args.command == "tune":
+        rules = make_rules(args.dice, args.dice_loss, args.wild_ones, args.spot_on)
+        targets = dict(zip(("easy", "medium", "hard"), args.target)) if args.target else None
+        best, share, loss = tune_ai_params(
+            generations=args.generations, population=args.population, matches=args.matches,
+            table_size=args.table_size, targets=targets, workers=args.workers, seed=args.seed,
+            start=load_ai_profile(args.out), rules=rules
+        )
+        save_ai_profile(best, args.out, policies=_read_ai_profile(args.out).get("policy"), meta={
+            "loss": loss, "share": share, "targets": targets or DEFAULT_TARGET_SHARE,
+            "table_size": args.table_size, "matches": args.matches, "rules": rules,
+        })
+        print(f"Saved profile to {args.out}")
+
+    elif args.command == "report":
+        stats = MatchStats(gold_bet=args.gold_bet)
+        if args.input:
+            results = iter_saved_results(args.input)
+        else:
+            results = iter_simulated_results(args.matches, args.table_size, seed=args.seed, workers=args.workers,
+                                             rules=make_rules(args.dice, args.dice_loss, args.wild_ones,
+                                                              args.spot_on))
+        out = open(args.save, "w", encoding="utf-8") if args.save and not args.input else None
+        try:
+            for res in results:
+                stats.add(res)
+                if out:
+                    out.write(json.dumps(res, separators=(",", ":")) + "\n")
+        finally:
+            if out:
+                out.close()
+        print(stats.report())
+
+    elif args.command == "startup":
+        ok = measure_startup(runs=args.runs, target_ms=args.target_ms)
+        return 0 if ok else 1
+
+    elif args.command == "broadcast":
+        import random
+        from .engine import EventBus, RoundStarted
+        from .simulate import _mixed_seats, simulate_match
+        from .broadcast import BROADCAST_PORT, Broadcaster
+
+        caster = Broadcaster(port=BROADCAST_PORT if args.port is None else args.port)
+        bus = EventBus()
+        caster.attach(bus)
+        if args.delay > 0:
+            bus.subscribe(RoundStarted, lambda ev: time.sleep(args.delay))
+        print(f"Broadcasting on {caster.address[0]}:{caster.address[1]} (watch with: liarsdice.py watch)")
+        rng = random.Random(args.seed)
+        try:
+            for _ in range(args.matches):
+                simulate_match(_mixed_seats(args.table_size), rng=rng, gold_bet=args.gold_bet, events=bus)
+            st = caster.stats()
+        finally:
+            caster.close()
+        print(f"{st['frames']} frames sent, {st['dropped']} dropped across {st['viewers']} viewers still connected")
+
+    elif args.command == "stress":
+        from .engine import make_rules
+        from .simulate import STRESS_SIZES, run_stress
+        run_stress(args.seats or STRESS_SIZES, seed=args.seed,
+                   rules=make_rules(args.dice, args.dice_loss, args.wild_ones, args.spot_on))
+
+    elif args.command == "memory":
+        from .persistence import (AI_MEMORY_COUNTER_CAP, AI_MEMORY_MAX_IDENTITIES, AI_MEMORY_RETENTION_DAYS,
+                                  maintain_ai_memory)
+        maintain_ai_memory(
+            args.file,
+            retention_days=AI_MEMORY_RETENTION_DAYS if args.retention_days is None else args.retention_days,
+            max_identities=AI_MEMORY_MAX_IDENTITIES if args.max_identities is None else args.max_identities,
+            counter_cap=AI_MEMORY_COUNTER_CAP if args.counter_cap is None else args.counter_cap,
+            dry_run=args.dry_run,
+        )
+
+    elif args.command == "watch":
+        from .broadcast import BROADCAST_HOST, BROADCAST_PORT, watch
+        try:
+            watch(args.host or BROADCAST_HOST, BROADCAST_PORT if args.port is None else args.port)
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+def main(argv=None):
+    """Runs a tool when given arguments, otherwise the standalone menu."""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        return run_command(argv)
+    from .ui import main_menu
+    return main_menu()
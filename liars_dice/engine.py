@@ -0,0 +1,627 @@
+"""
+Game rules and match mechanics: probabilities, rule variants, partners, payouts,
+round bookkeeping and match events. Imports nothing from the rest of the package.
+"""
+import random
+from functools import lru_cache
+from math import exp, lgamma, log
+from array import array
+from collections import namedtuple
+
+# =========================
+# AI stats
+# =========================
+BASE_STATS = {
+    "bluffs_caught": 0,
+    "defended_success": 0,
+    "bluffs_made": 0,
+    "bluff_success": 0,
+    "truths_made": 0,
+    "truth_success": 0,
+}
+
+def _ensure_ai(mem, name):
+    if name not in mem:
+        mem[name] = {k: 0 for k in BASE_STATS}
+
+def merge_match_into_global(global_mem, match_mem):
+    for name, stats in match_mem.items():
+        _ensure_ai(global_mem, name)
+        for k in BASE_STATS:
+            global_mem[name][k] += stats.get(k, 0)
+
+# =========================
+# Probability helper
+# =========================
+# Past this many dice a whole table costs more than it saves (a 10,000-seat match
+# asks about thousands of different dice counts, each once or twice), so single
+# tails are summed outwards from the asked-for count instead.
+TAIL_ROW_MAX_DICE = 1024
+# room for every row of every per-die odds a rule set has (see face_probabilities),
+# so warming a big match never pushes its own rows back out
+TAIL_ROW_CACHE_SIZE = 2 * (TAIL_ROW_MAX_DICE + 1)
+
+@lru_cache(maxsize=TAIL_ROW_CACHE_SIZE)
+def prob_tail_row(k, p=1/6):
+    """
+    Whole tail table for k dice: row[n] = P(at least n succeed), n = 0..k+1.
+
+    Built once per (k, p) in log space (so it holds up past a thousand dice, where
+    comb() no longer fits in a float) and cached as a flat array of doubles; the AI
+    reads it instead of re-summing the binomial on every decision.
+    """
+    row = array("d", bytes(8 * (k + 2)))
+    if k < 0:
+        return row
+    if p >= 1.0:
+        row[:k + 1] = array("d", [1.0]) * (k + 1)
+        return row
+    lp, lq = log(p), log(1 - p)
+    base = lgamma(k + 1)
+    acc = 0.0
+    for i in range(k, -1, -1):
+        acc += exp(base - lgamma(i + 1) - lgamma(k - i + 1) + i * lp + (k - i) * lq)
+        row[i] = acc
+    row[0] = 1.0
+    return row
+
+def _log_pmf(n, k, p):
+    return lgamma(k + 1) - lgamma(n + 1) - lgamma(k - n + 1) + n * log(p) + (k - n) * log(1 - p)
+
+@lru_cache(maxsize=8192)
+def _prob_tail_large(n, k, p):
+    """P(at least n of k dice succeed) for big k, summing only the terms that matter."""
+    ratio = p / (1 - p)
+    if n > (k + 1) * p:
+        # Upper tail: terms only shrink from n upwards.
+        term = exp(_log_pmf(n, k, p))
+        total = 0.0
+        i = n
+        while term > total * 1e-17 and i <= k:
+            total += term
+            term *= (k - i) / (i + 1) * ratio
+            i += 1
+        return min(total, 1.0)
+    # Lower tail: terms only shrink from n-1 downwards.
+    term = exp(_log_pmf(n - 1, k, p))
+    total = 0.0
+    i = n - 1
+    while term > total * 1e-17 and i >= 0:
+        total += term
+        term *= i / (k - i + 1) / ratio
+        i -= 1
+    return max(0.0, 1.0 - total)
+
+def prob_tail(n, k, p=1/6):
+    """P(at least n of k dice succeed), from the cached table."""
+    if n <= 0:
+        return 1.0
+    if n > k:
+        return 0.0
+    if k > TAIL_ROW_MAX_DICE and p < 1.0:
+        return _prob_tail_large(n, k, p)
+    return prob_tail_row(k, p)[n]
+
+def prob_at_least(n, k, p=1/6):
+    """The name prob_tail had before the tables; kept for existing callers."""
+    return prob_tail(n, k, p)
+
+def prob_exact(n, k, p=1/6):
+    """P(exactly n of k dice succeed), from the cached table."""
+    if n < 0 or n > k:
+        return 0.0
+    if k > TAIL_ROW_MAX_DICE and p < 1.0:
+        return exp(_log_pmf(n, k, p))
+    row = prob_tail_row(k, p)
+    return row[n] - row[n + 1]
+
+def precompute_prob_tables(max_dice, rules=None):
+    """
+    Warms the tail tables a match can need (per-die odds of every face under
+    `rules`); rows an earlier match built are cache hits and cost nothing.
+    """
+    for p in face_probabilities(rules):
+        for k in range(min(max_dice, TAIL_ROW_MAX_DICE) + 1):
+            prob_tail_row(k, p)
+
+# =========================
+# Rules
+# =========================
+SPOT_ON = "spot_on"
+
+def make_rules(dice_per_player=4, dice_loss=False, wild_ones=False, spot_on=False):
+    """
+    Match rules.
+      dice_per_player: dice each player starts with
+      dice_loss: losing a challenge costs one die and a player is out once they
+                 have none (the classic game); otherwise the loser is out at once
+      wild_ones: 1s count towards every other face's bid
+      spot_on: instead of calling bluff, a player may claim the bid is exactly
+               right; if it is the bidder loses the challenge, otherwise the caller
+    """
+    return {"dice_per_player": max(1, int(dice_per_player)), "dice_loss": bool(dice_loss),
+            "wild_ones": bool(wild_ones), "spot_on": bool(spot_on)}
+
+def face_probabilities(rules=None):
+    """The distinct per-die success odds bids can have under `rules`."""
+    return (1/6, 1/3) if rules and rules.get("wild_ones") else (1/6,)
+
+def _face_p(face, rules):
+    return 1/3 if rules.get("wild_ones") and face != 1 else 1/6
+
+def _bid_count(face_totals, face, rules):
+    """How many dice on the table count towards a bid on `face`."""
+    if rules.get("wild_ones") and face != 1:
+        return face_totals[face] + face_totals[1]
+    return face_totals[face]
+
+DEFAULT_RULES = make_rules()
+
+def _lose_challenge(name, active_players, dice_counts, rules):
+    """Applies a lost challenge to `name`; returns (dice_lost, eliminated)."""
+    if rules["dice_loss"] and dice_counts[name] > 1:
+        dice_counts[name] -= 1
+        return 1, False
+    active_players.pop(name, None)
+    return dice_counts.pop(name, 0), True
+
+def _stock_d6_bits(rng):
+    """
+    rng.getrandbits when rng is the stock generator (a plain random.Random or the
+    random module itself), else None.
+
+    For the stock generator rng.randint(1, 6) is 1 + getrandbits(3), redrawn while
+    the bits come out 6 or 7. That is CPython's own implementation, pinned draw for
+    draw by tests/test_dice.py, so _roll_all can take the bits directly. Subclasses
+    and other rngs get None and keep going through their own randint.
+    """
+    if rng is random or type(rng) is random.Random:
+        return rng.getrandbits
+    return None
+
+def _roll_all(active_players, dice_counts, rng=random):
+    """Rolls every living player's dice; returns the table's face totals, index = face."""
+    face_totals = [0] * 7
+    bits = _stock_d6_bits(rng)
+    for name in active_players:
+        if bits is None:
+            dice = [rng.randint(1, 6) for _ in range(dice_counts[name])]
+        else:
+            dice = []
+            for _ in range(dice_counts[name]):
+                v = bits(3)
+                while v >= 6:
+                    v = bits(3)
+                dice.append(v + 1)
+        active_players[name] = dice
+        for v in dice:
+            face_totals[v] += 1
+    return face_totals
+
+# =========================
+# Partner helpers
+# =========================
+def assign_partners(players, rng=random):
+    """
+    Assigns mutual partner groups based on player count.
+
+    Returns:
+      partners_map: dict[str, list[str]]  # each player -> list of their partners
+      k_partners: int                     # number of partners per player
+      max_winners: int                    # number of total winners allowed
+      split_rule: list[int]               # gold split percentages summing to ~100
+    """
+    n = len(players)
+    if n >= 32:
+        k = 3
+        max_winners = 4
+        split = [25, 25, 25, 25]
+    elif n >= 18:
+        k = 2
+        max_winners = 3
+        split = [34, 33, 33]
+    else:
+        k = 1
+        max_winners = 2
+        split = [50, 50]
+
+    order = players[:]
+    rng.shuffle(order)
+
+    # initialize everyone with empty partner lists
+    partners = {p: [] for p in order}
+
+    if k == 1:
+        # Pair players evenly (A↔B, C↔D, etc.)
+        for i in range(0, len(order) - 1, 2):
+            a, b = order[i], order[i + 1]
+            partners[a].append(b)
+            partners[b].append(a)
+        # if odd number of players, last one pairs with first
+        if len(order) % 2 == 1:
+            last, first = order[-1], order[0]
+            partners[last].append(first)
+            partners[first].append(last)
+
+    elif k == 2:
+        # Group players in triplets that all share each other as partners
+        for i in range(0, len(order), 3):
+            group = order[i:i + 3]
+            for p in group:
+                partners[p].extend([x for x in group if x != p])
+        # Handle leftover players if not divisible by 3
+        leftover = len(order) % 3
+        if leftover and len(order) > 3:
+            group = order[-leftover:]
+            for p in group:
+                partners[p].extend([x for x in group if x != p])
+
+    elif k == 3:
+        # Group players in fours that all share each other as partners
+        for i in range(0, len(order), 4):
+            group = order[i:i + 4]
+            for p in group:
+                partners[p].extend([x for x in group if x != p])
+        # Handle leftovers (just pair them with last full group)
+        leftover = len(order) % 4
+        if leftover and len(order) > 4:
+            group = order[-leftover:]
+            for p in group:
+                partners[p].extend([x for x in group if x != p])
+
+    return partners, k, max_winners, split
+
+def all_partner_dice(name, partners_map, active_players):
+    dice = []
+    for partner in partners_map.get(name, []):
+        if partner in active_players:
+            dice.extend(active_players[partner])
+    return dice
+
+def _hand_counts(dice, rules):
+    """Per-face counts of one hand as bids count them (ones included when wild), index = face."""
+    counts = [0] * 7
+    for v in dice:
+        counts[v] += 1
+    if rules.get("wild_ones"):
+        ones = counts[1]
+        for f in range(2, 7):
+            counts[f] += ones
+    return counts
+
+class RoundHands:
+    """
+    The round's dice counted at most once per player: per-face counts and best
+    face of a hand, and the same counts pooled over its living partners. Hands
+    and partners only change between rounds, so every AI turn of the round
+    reads from here instead of rescanning dice lists. A hand is counted the
+    first time someone asks for it, so seats that never act cost nothing.
+    """
+    __slots__ = ("active_players", "partners", "rules", "_hands", "_pooled")
+
+    def __init__(self, active_players, partners, rules):
+        self.active_players = active_players
+        self.partners = partners
+        self.rules = rules
+        self._hands = {}
+        self._pooled = {}
+
+    def hand(self, name):
+        """(per-face counts of `name`'s dice, index = face; their most plentiful face)."""
+        hand = self._hands.get(name)
+        if hand is None:
+            counts = _hand_counts(self.active_players[name], self.rules)
+            best = 1
+            for f in range(2, 7):
+                if counts[f] > counts[best]:
+                    best = f
+            hand = self._hands[name] = (counts, best)
+        return hand
+
+    def partner_counts(self, name):
+        """(per-face counts over `name`'s living partners, how many dice they hold)."""
+        pooled = self._pooled.get(name)
+        if pooled is None:
+            counts = [0] * 7
+            size = 0
+            active_players = self.active_players
+            for partner in self.partners.get(name, ()):
+                if partner in active_players:
+                    counts = [a + b for a, b in zip(counts, self.hand(partner)[0])]
+                    size += len(active_players[partner])
+            pooled = self._pooled[name] = (counts, size)
+        return pooled
+
+# =========================
+# Payouts
+# =========================
+PAYOUT_LABELS = {(50, 50): "50/50", (75, 25): "75/25", (34, 33, 33): "34/33/33", (25, 25, 25, 25): "25x4"}
+
+def payout_rule(survivors, partners_map, split_rule, lead="Knight"):
+    """
+    Which split applies to a final group, without touching any gold.
+
+    Returns (label, ranked, percents): `ranked` puts `lead` first when it survived
+    (it takes the larger share of an uneven split), and `percents` lines up with
+    `ranked`, or is None for an even split of an unexpected group size.
+    """
+    survivors = list(survivors)
+    if lead in survivors:
+        ranked = [lead] + [s for s in survivors if s != lead]
+    else:
+        ranked = survivors
+    n = len(ranked)
+    if n == 2 and lead in survivors and ranked[1] in partners_map.get(lead, []):
+        percents = (75, 25)
+    elif n == len(split_rule):
+        percents = tuple(split_rule)
+    else:
+        return "even", ranked, None
+    return PAYOUT_LABELS.get(percents, "/".join(map(str, percents))), ranked, percents
+
+def compute_payouts(pot, survivors, partners_map, split_rule, lead="Knight"):
+    """
+    Splits `pot` across `survivors` and returns {name: gold} for every survivor.
+
+    Shares are floored percentages of the pot; the gold lost to rounding goes one
+    piece at a time to the survivors after the lead, so the lead's share matches
+    the printed rule and the returned amounts always add up to the pot exactly.
+    """
+    _, ranked, percents = payout_rule(survivors, partners_map, split_rule, lead)
+    n = len(ranked)
+    if n == 0:
+        return {}
+    if percents is None:
+        amounts = [pot // n] * n
+    else:
+        amounts = [(pot * pct) // 100 for pct in percents]
+    remainder = pot - sum(amounts)
+    order = list(range(1, n)) + [0] if n > 1 else [0]
+    i = 0
+    while remainder > 0:
+        amounts[order[i % n]] += 1
+        remainder -= 1
+        i += 1
+    return dict(zip(ranked, amounts))
+
+# =========================
+# Table state
+# =========================
+class SeatStats:
+    """
+    One match's AI stats for a fixed set of seats: a flat array of counters,
+    len(BASE_STATS) per seat, indexed by the seat's integer id (its position in
+    `players`). items() gives the name -> stats dicts that merging and
+    checkpoints expect, built only when asked for. The ids stay inside this
+    record: the rest of the table (hands, dice counts, seating, partners) is
+    keyed by name.
+    """
+    __slots__ = ("players", "ids", "_counts")
+
+    _FIELDS = {k: i for i, k in enumerate(BASE_STATS)}
+
+    def __init__(self, players):
+        self.players = list(players)
+        self.ids = {name: i for i, name in enumerate(self.players)}
+        self._counts = array("l", bytes(array("l").itemsize * len(BASE_STATS) * len(self.players)))
+
+    def add(self, name, keys):
+        base = self.ids[name] * len(BASE_STATS)
+        fields = self._FIELDS
+        for k in keys:
+            self._counts[base + fields[k]] += 1
+
+    def set(self, name, values):
+        base = self.ids[name] * len(BASE_STATS)
+        self._counts[base:base + len(BASE_STATS)] = array("l", values)
+
+    def get(self, name):
+        base = self.ids[name] * len(BASE_STATS)
+        return dict(zip(BASE_STATS, self._counts[base:base + len(BASE_STATS)]))
+
+    def items(self):
+        for name in self.players:
+            yield name, self.get(name)
+
+class BidRecord:
+    """
+    The standing bid of the current round and whether it has been settled, reused
+    for every bid of a match instead of a fresh dict per bid.
+    """
+    __slots__ = ("bidder", "qty", "face", "was_bluff", "resolved")
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.bidder = None
+        self.qty = self.face = 0
+        self.was_bluff = self.resolved = False
+
+    def set(self, bidder, qty, face, actual):
+        self.bidder = bidder
+        self.qty = qty
+        self.face = face
+        self.was_bluff = qty > actual
+        self.resolved = False
+
+# =========================
+# Round bookkeeping
+# =========================
+def _pick_round_starter(ordered_all, alive_set, after_name, round_start_index, positions=None):
+    """
+    The first living player after `after_name`, else the next one in the rotation.
+    `positions` (name -> index in ordered_all) spares big tables a linear search.
+    """
+    if after_name:
+        if positions is not None:
+            idx_base = positions.get(after_name, -1)
+        elif after_name in ordered_all:
+            idx_base = ordered_all.index(after_name)
+        else:
+            idx_base = -1
+        for step in range(1, len(ordered_all)+1):
+            cand = ordered_all[(idx_base + step) % len(ordered_all)]
+            if cand in alive_set:
+                return cand, round_start_index
+    for _ in range(len(ordered_all)):
+        cand = ordered_all[round_start_index % len(ordered_all)]
+        round_start_index += 1
+        if cand in alive_set:
+            return cand, round_start_index
+    return None, round_start_index
+
+_TRUTH_KEYS = ("truths_made", "truth_success", "defended_success")
+_BLUFF_KEYS = ("bluffs_made", "bluffs_caught")
+
+def _record_call_outcome(bidder, caller, was_truth, global_memory, match_memory, opponent_model, spot_on=False,
+                         exact=False):
+    """
+    Credits a called bid to `bidder`. A spot-on call (`exact`: the count matched
+    the bid) never counts as a defended or caught bid: the bid is tallied as a
+    truth or a bluff, plus a success when the bidder won the challenge.
+    """
+    _ensure_ai(global_memory, bidder)
+    if spot_on:
+        if opponent_model is not None:
+            opponent_model.observe(caller, bidder, global_memory, bluffed=not was_truth,
+                                   bluff_succeeded=True if not was_truth else None)
+        if not was_truth:
+            keys = ("bluffs_made", "bluff_success")
+        else:
+            keys = ("truths_made",) if exact else ("truths_made", "truth_success")
+    else:
+        if opponent_model is not None:
+            opponent_model.observe(caller, bidder, global_memory, bluffed=not was_truth,
+                                   defended=was_truth, bluff_succeeded=False if not was_truth else None)
+        keys = _TRUTH_KEYS if was_truth else _BLUFF_KEYS
+    stats = global_memory[bidder]
+    for k in keys:
+        stats[k] += 1
+    match_memory.add(bidder, keys)
+
+def _credit_previous_bid(last_bid, raiser, global_memory, opponent_model):
+    """Credits the unresolved previous bid once someone raises over it; True if anything changed."""
+    if last_bid.bidder is None or last_bid.resolved:
+        return False
+    prev_bidder = last_bid.bidder
+    if opponent_model is not None:
+        opponent_model.observe(raiser, prev_bidder, global_memory, bluffed=last_bid.was_bluff,
+                               bluff_succeeded=True if last_bid.was_bluff else None)
+    if last_bid.was_bluff:
+        global_memory[prev_bidder]["bluff_success"] += 1
+    else:
+        global_memory[prev_bidder]["truth_success"] += 1
+    return True
+
+def _place_bid(last_bid, bidder, qty, face, face_totals, global_memory, opponent_model, rules, bus=None):
+    """Credits the bid being raised over and puts `bidder`'s (qty, face) on the table."""
+    credited = _credit_previous_bid(last_bid, bidder, global_memory, opponent_model)
+    last_bid.set(bidder, qty, face, _bid_count(face_totals, face, rules))
+    if bus is not None and bus.wants(BidMade):
+        bus.emit(BidMade(bidder, qty, face, credited))
+
+def _resolve_challenge(caller, bidder, bid, spot_on, face_totals, active_players, dice_counts, last_bid,
+                       global_memory, match_memory, opponent_model, rules, bus=None):
+    """
+    Settles a call on `bidder`'s bid: records the outcome, takes a die (or the
+    seat) from whoever lost and emits ChallengeResolved, then PlayerOut or DieLost.
+    Returns (loser, dice_lost, eliminated).
+    """
+    qty, face = bid
+    actual_count = _bid_count(face_totals, face, rules)
+    was_truth = actual_count >= qty
+    if last_bid.bidder == bidder:
+        last_bid.resolved = True
+    _record_call_outcome(bidder, caller, was_truth, global_memory, match_memory, opponent_model, spot_on,
+                         actual_count == qty)
+    if bus is not None and bus.wants(ChallengeResolved):
+        bus.emit(ChallengeResolved(caller, bidder, qty, face, actual_count, spot_on, active_players, rules))
+
+    if spot_on:
+        if actual_count == qty:
+            loser, verdict = bidder, "was called spot on"
+        else:
+            loser, verdict = caller, "missed the spot-on call"
+    elif was_truth:
+        loser, verdict = caller, "loses the bluff"
+    else:
+        loser, verdict = bidder, "was bluffing"
+    if loser not in active_players:
+        return loser, 0, False
+    players_left = len(active_players)
+    lost, out = _lose_challenge(loser, active_players, dice_counts, rules)
+    if out:
+        if bus is not None and bus.wants(PlayerOut):
+            bus.emit(PlayerOut(loser, verdict, "Knight" in active_players, players_left))
+    elif bus is not None and bus.wants(DieLost):
+        bus.emit(DieLost(loser, verdict, dice_counts[loser], players_left))
+    return loser, lost, out
+
+# =========================
+# Match events
+# =========================
+MatchStarted = namedtuple("MatchStarted", "match_id players pot gold_bet rules resumed")
+RoundStarted = namedtuple("RoundStarted", "number starter total_dice")
+TurnStarted = namedtuple("TurnStarted", "number player")
+BidMade = namedtuple("BidMade", "bidder qty face credited")
+ChallengeResolved = namedtuple("ChallengeResolved", "caller bidder qty face actual spot_on hands rules")
+PlayerOut = namedtuple("PlayerOut", "name verdict knight_alive players_left")
+DieLost = namedtuple("DieLost", "name verdict dice_left players_left")
+MatchEnded = namedtuple("MatchEnded", "match_id survivors elimination_order payouts")
+MATCH_EVENTS = (MatchStarted, RoundStarted, TurnStarted, BidMade, ChallengeResolved, PlayerOut, DieLost, MatchEnded)
+
+class EventBus:
+    """
+    Fans match events out to whoever subscribed to that event type.
+
+    The game checks wants() before building an event, so an event type nobody
+    listens to costs one dict lookup and nothing else.
+    """
+    def __init__(self):
+        self._subs = {}
+
+    def subscribe(self, event_type, fn):
+        self._subs.setdefault(event_type, []).append(fn)
+        return event_type, fn
+
+    def unsubscribe(self, event_type, fn):
+        fns = self._subs.get(event_type)
+        if fns and fn in fns:
+            fns.remove(fn)
+            if not fns:
+                del self._subs[event_type]
+
+    def wants(self, event_type):
+        return event_type in self._subs
+
+    def emit(self, event):
+        for fn in self._subs.get(type(event), ()):
+            fn(event)
+
+def detach(bus, handles):
+    for event_type, fn in handles:
+        bus.unsubscribe(event_type, fn)
+
+def attach_telemetry(bus):
+    """Counts what happened; returns (handles, counters)."""
+    counters = {"rounds": 0, "turns": 0, "bids": 0, "challenges": 0, "spot_on": 0, "eliminations": 0,
+                "dice_lost": 0}
+
+    def bump(key):
+        def on_event(ev):
+            counters[key] += 1
+        return on_event
+
+    def on_challenge(ev):
+        counters["challenges"] += 1
+        if ev.spot_on:
+            counters["spot_on"] += 1
+
+    handles = [bus.subscribe(RoundStarted, bump("rounds")),
+               bus.subscribe(TurnStarted, bump("turns")),
+               bus.subscribe(BidMade, bump("bids")),
+               bus.subscribe(ChallengeResolved, on_challenge),
+               bus.subscribe(PlayerOut, bump("eliminations")),
+               bus.subscribe(DieLost, bump("dice_lost"))]
+    return handles, counters
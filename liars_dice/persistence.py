@@ -0,0 +1,585 @@
+"""
+Everything that touches disk between matches: AI memory, the gold ledger, match
+checkpoints, and the event subscribers that keep them up to date during play.
+"""
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+from collections import deque
+
+from .engine import (BASE_STATS, DEFAULT_RULES, BidMade, ChallengeResolved, MatchEnded, MatchStarted, PlayerOut,
+                     SeatStats, TurnStarted, _ensure_ai, make_rules, merge_match_into_global)
+
+# =========================
+# Persistent AI memory
+# =========================
+AI_MEMORY_FILE = "ai_memory.json"
+
+# Retention: the file is re-read on every match start and save, so it is kept
+# from growing without bound. Identities not seen for AI_MEMORY_RETENTION_DAYS
+# are dropped (oldest first past AI_MEMORY_MAX_IDENTITIES), and once any of an
+# identity's counters passes AI_MEMORY_COUNTER_CAP all of them are halved, which
+# keeps the ratios the AI reads while letting recent play outweigh old play.
+AI_MEMORY_RETENTION_DAYS = 180
+AI_MEMORY_MAX_IDENTITIES = 5000
+AI_MEMORY_COUNTER_CAP = 10000
+
+class AIMemory(dict):
+    """
+    AI stats as loaded from disk, plus `synced`: the counters as they were the last
+    time this process read or wrote the file. The difference is what this process
+    has learned since, which is all save_ai_memory adds on top of the file.
+    `seen` holds the names this process has seated; saves stamp them as active.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.synced = {}
+        self.seen = set()
+
+    def mark_synced(self):
+        self.synced = {name: dict(stats) for name, stats in self.items()}
+
+    def touch(self, names):
+        for name in names:
+            _ensure_ai(self, name)
+            self.seen.add(name)
+
+def _atomic_write_json(path, data, **dump_kwargs):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, **dump_kwargs)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+@contextmanager
+def _file_lock(path):
+    """Exclusive lock on `path`.lock shared by every process on the host, held for the with-block."""
+    with open(f"{path}.lock", "a+b") as lf:
+        if os.name == "nt":
+            import msvcrt
+            lf.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(lf.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+            try:
+                yield
+            finally:
+                lf.seek(0)
+                msvcrt.locking(lf.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(lf.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lf.fileno(), fcntl.LOCK_UN)
+
+def _read_ai_memory_file(path=None, last_seen=None):
+    """{name: counters} from the memory file; fills `last_seen` (if given) with each entry's stamp."""
+    path = path or AI_MEMORY_FILE
+    data = {}
+    if os.path.exists(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+                for k, v in raw.items():
+                    data[k] = {kk: int(v.get(kk, 0)) for kk in BASE_STATS}
+                    if last_seen is not None:
+                        last_seen[k] = int(v.get("last_seen", 0))
+        except Exception:
+            data = {}
+    return data
+
+def _write_ai_memory_file(data, last_seen, path=None):
+    _atomic_write_json(path or AI_MEMORY_FILE,
+                       {name: dict(stats, last_seen=last_seen.get(name, 0)) for name, stats in data.items()},
+                       indent=2)
+
+def compact_ai_memory(data, last_seen, now=None, retention_days=AI_MEMORY_RETENTION_DAYS,
+                      max_identities=AI_MEMORY_MAX_IDENTITIES, counter_cap=AI_MEMORY_COUNTER_CAP, keep=()):
+    """
+    Applies the retention policy to `data` / `last_seen` in place; names in `keep`
+    always survive. Entries from before stamps existed (0) count as seen now.
+    Returns (names_dropped, names_decayed). Negative limits count as 0.
+    """
+    retention_days, max_identities, counter_cap = max(0, retention_days), max(0, max_identities), max(0, counter_cap)
+    now = int(time.time() if now is None else now)
+    for name in data:
+        if not last_seen.get(name):
+            last_seen[name] = now
+    cutoff = now - retention_days * 86400
+    drop = [name for name in data if last_seen[name] < cutoff and name not in keep]
+    if len(data) - len(drop) > max_identities:
+        gone = set(drop)
+        rest = sorted((last_seen[n], n) for n in data if n not in gone and n not in keep)
+        drop += [n for _, n in rest[:len(data) - len(drop) - max_identities]]
+    for name in drop:
+        del data[name]
+        last_seen.pop(name, None)
+    decayed = 0
+    for stats in data.values():
+        if max(stats.values(), default=0) > counter_cap:
+            while max(stats.values()) > counter_cap:
+                for k in stats:
+                    stats[k] //= 2
+            decayed += 1
+    return len(drop), decayed
+
+def load_ai_memory(players):
+    data = AIMemory(_read_ai_memory_file())
+    data.mark_synced()
+    data.touch(players)
+    return data
+
+def save_ai_memory(memory):
+    """
+    Writes AI stats without losing other processes' updates: under the host-wide
+    lock, re-read the file, add only what this process changed since its last sync,
+    apply the retention policy, and replace the file atomically. `memory` is
+    refreshed in place with the merged totals. A plain dict (not from
+    load_ai_memory) is written as-is.
+    """
+    try:
+        with _file_lock(AI_MEMORY_FILE):
+            if isinstance(memory, AIMemory):
+                last_seen = {}
+                merged = _read_ai_memory_file(last_seen=last_seen)
+                now = int(time.time())
+                active = set(memory.seen)
+                zero = BASE_STATS
+                for name, stats in memory.items():
+                    base = memory.synced.get(name, zero)
+                    delta = [(k, stats.get(k, 0) - base.get(k, 0)) for k in BASE_STATS]
+                    if any(d for _, d in delta):
+                        active.add(name)
+                    elif name not in active:
+                        continue    # nothing new; another process may have retired it
+                    disk = merged.setdefault(name, {k: 0 for k in BASE_STATS})
+                    for k, d in delta:
+                        disk[k] += d
+                    last_seen[name] = now
+                compact_ai_memory(merged, last_seen, now, keep=active)
+                for name in [n for n in memory if n not in merged]:
+                    del memory[name]
+                for name, stats in merged.items():
+                    if name in memory:
+                        memory[name].update(stats)
+                    else:
+                        memory[name] = stats
+                memory.mark_synced()
+                _write_ai_memory_file(merged, last_seen)
+            else:
+                _atomic_write_json(AI_MEMORY_FILE, memory, indent=2)
+    except Exception:
+        pass
+
+def _time_ai_memory_load(path, runs=5):
+    times = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        _read_ai_memory_file(path)
+        times.append((time.perf_counter() - t0) * 1000)
+    times.sort()
+    return times[len(times) // 2]
+
+def maintain_ai_memory(path=None, retention_days=AI_MEMORY_RETENTION_DAYS, max_identities=AI_MEMORY_MAX_IDENTITIES,
+                       counter_cap=AI_MEMORY_COUNTER_CAP, dry_run=False, log=print):
+    """
+    Compacts the AI memory file now (the same policy every save applies) and logs
+    its size, identity count and load time before and after. Returns the summary.
+    """
+    path = path or AI_MEMORY_FILE
+    with _file_lock(path):
+        size_before = os.path.getsize(path) if os.path.exists(path) else 0
+        load_before = _time_ai_memory_load(path)
+        last_seen = {}
+        data = _read_ai_memory_file(path, last_seen)
+        count_before = len(data)
+        dropped, decayed = compact_ai_memory(data, last_seen, retention_days=retention_days,
+                                             max_identities=max_identities, counter_cap=counter_cap)
+        if not dry_run and size_before:
+            _write_ai_memory_file(data, last_seen, path)
+        size_after = os.path.getsize(path) if os.path.exists(path) and not dry_run else size_before
+        load_after = _time_ai_memory_load(path) if not dry_run else load_before
+    summary = {"identities": (count_before, len(data)), "dropped": dropped, "decayed": decayed,
+               "bytes": (size_before, size_after), "load_ms": (load_before, load_after)}
+    log(f"{path}{' (dry run)' if dry_run else ''}")
+    log(f"  identities: {count_before} -> {len(data)} ({dropped} dropped, {decayed} decayed)")
+    log(f"  file size:  {size_before / 1024:.1f} KB -> {size_after / 1024:.1f} KB")
+    log(f"  load time:  {load_before:.2f} ms -> {load_after:.2f} ms")
+    return summary
+
+# =========================
+# Background preloading
+# =========================
+class _Preload:
+    """Runs fn(*args) on a daemon thread; result() waits for it and gives None if it failed."""
+    def __init__(self, fn, *args):
+        self._value = None
+        self._thread = threading.Thread(target=self._run, args=(fn, args), daemon=True)
+        self._thread.start()
+
+    def _run(self, fn, args):
+        try:
+            self._value = fn(*args)
+        except Exception:
+            self._value = None
+
+    def result(self):
+        self._thread.join()
+        return self._value
+
+_ai_memory_preload = None
+
+def preload_ai_memory():
+    """Starts reading AI_MEMORY_FILE in the background so the next match doesn't wait on it."""
+    global _ai_memory_preload
+    if _ai_memory_preload is None:
+        _ai_memory_preload = _Preload(load_ai_memory, [])
+    return _ai_memory_preload
+
+def _take_ai_memory(players):
+    """The preloaded AI memory if there is one (used once), else a synchronous load."""
+    global _ai_memory_preload
+    pending, _ai_memory_preload = _ai_memory_preload, None
+    data = pending.result() if pending is not None else None
+    if data is None:
+        return load_ai_memory(players)
+    data.touch(players)
+    return data
+
+# =========================
+# Player economy ledger
+# =========================
+LEDGER_FILE = "ledger.json"
+LEDGER_JOURNAL_FILE = "ledger.journal"
+LEDGER_COMPACT_EVERY = 500
+STARTING_GOLD = 500
+BEATEN_KEYS = ("easy_beaten", "medium_beaten", "hard_beaten")
+
+class Ledger:
+    """
+    Gold, bets, payouts and beaten lists for every player, human or AI.
+
+    Each transaction is appended to a journal as one JSON line and fsynced before
+    it is applied in memory. Every `compact_every` entries the whole state is
+    written to a snapshot (temp file + rename, so a crash leaves the old or the
+    new snapshot, never half of one) and the journal is emptied. Loading reads the
+    snapshot and replays the journal after it; a torn last line from a crash is
+    dropped, and entries the snapshot already covers are skipped by sequence number.
+    """
+    def __init__(self, path=LEDGER_FILE, journal_path=LEDGER_JOURNAL_FILE, compact_every=LEDGER_COMPACT_EVERY,
+                 fsync=True):
+        self.path = path
+        self.journal_path = journal_path
+        self.compact_every = max(1, int(compact_every))
+        self.fsync = fsync
+        self.accounts = {}
+        self.seq = 0
+        self._pending = 0
+        self._batch = None
+        self._lock = threading.RLock()
+        self._load()
+        self._journal = open(self.journal_path, "a", encoding="utf-8")
+
+    # ---- loading ----
+    def _load(self):
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    snap = json.load(f)
+                self.accounts = snap.get("accounts", {})
+                self.seq = int(snap.get("seq", 0))
+            except Exception:
+                self.accounts, self.seq = {}, 0
+        if not os.path.exists(self.journal_path):
+            return
+        good = 0
+        with open(self.journal_path, "rb") as f:
+            for raw in f:
+                try:
+                    entry = json.loads(raw)
+                except ValueError:
+                    break
+                if not raw.endswith(b"\n"):
+                    break
+                good += len(raw)
+                if entry.get("seq", 0) > self.seq:
+                    self._apply(entry)
+                    self.seq = entry["seq"]
+                    self._pending += 1
+        # drop a torn tail so new entries start on a clean line
+        if good != os.path.getsize(self.journal_path):
+            with open(self.journal_path, "r+b") as f:
+                f.truncate(good)
+
+    # ---- state ----
+    def account(self, name):
+        acct = self.accounts.get(name)
+        if acct is None:
+            acct = self.accounts[name] = {
+                "gold": STARTING_GOLD, "bets": 0, "wagered": 0, "payouts": 0, "won": 0,
+                **{k: [] for k in BEATEN_KEYS},
+            }
+        return acct
+
+    def gold(self, name):
+        return self.account(name)["gold"]
+
+    def _apply(self, entry):
+        acct = self.account(entry["name"])
+        op = entry["op"]
+        if op == "bet":
+            acct["gold"] -= entry["amount"]
+            acct["bets"] += 1
+            acct["wagered"] += entry["amount"]
+        elif op == "payout":
+            acct["gold"] += entry["amount"]
+            acct["payouts"] += 1
+            acct["won"] += entry["amount"]
+        elif op == "beaten":
+            beaten = acct.setdefault(entry["key"], [])
+            if entry["opponent"] not in beaten:
+                beaten.append(entry["opponent"])
+        elif op == "set_gold":
+            acct["gold"] = entry["amount"]
+
+    # ---- writing ----
+    def record(self, op, name, **fields):
+        with self._lock:
+            self.seq += 1
+            entry = {"seq": self.seq, "op": op, "name": name, **fields}
+            line = json.dumps(entry, separators=(",", ":")) + "\n"
+            if self._batch is not None:
+                self._batch.append(line)
+            else:
+                self._write_lines([line])
+            self._apply(entry)
+            self._pending += 1
+            if self._batch is None and self._pending >= self.compact_every:
+                self.compact()
+
+    def _write_lines(self, lines):
+        self._journal.write("".join(lines))
+        self._journal.flush()
+        if self.fsync:
+            os.fsync(self._journal.fileno())
+
+    @contextmanager
+    def transaction(self):
+        """Groups records into a single journal write and fsync (e.g. all antes of one match)."""
+        with self._lock:
+            outer = self._batch is None
+            if outer:
+                self._batch = []
+            try:
+                yield self
+            finally:
+                if outer:
+                    lines, self._batch = self._batch, None
+                    if lines:
+                        self._write_lines(lines)
+                    if self._pending >= self.compact_every:
+                        self.compact()
+
+    def bet(self, name, amount, match=None):
+        self.record("bet", name, amount=int(amount), match=match)
+
+    def payout(self, name, amount, match=None):
+        self.record("payout", name, amount=int(amount), match=match)
+
+    def beaten(self, name, key, opponent):
+        if opponent not in self.account(name).get(key, []):
+            self.record("beaten", name, key=key, opponent=opponent)
+
+    def compact(self):
+        """Writes a fresh snapshot and empties the journal."""
+        with self._lock:
+            _atomic_write_json(self.path, {"seq": self.seq, "accounts": self.accounts},
+                               separators=(",", ":"))
+            self._journal.close()
+            self._journal = open(self.journal_path, "w", encoding="utf-8")
+            self._pending = 0
+
+    def close(self):
+        with self._lock:
+            if not self._journal.closed:
+                self._journal.close()
+
+# =========================
+# Match checkpoints
+# =========================
+MATCH_CHECKPOINT_FILE = "match_checkpoint.json"
+
+class MatchCheckpoint:
+    """
+    Round-boundary snapshots of one match, so a killed process can pick it back up.
+
+    Everything fixed for the match (roster, partners, pot, split) is serialized
+    once by begin(); save() only serializes what moves between rounds and splices
+    it onto that cached header, then swaps the file in with a rename. Players are
+    stored as indices into the roster to keep big tables small.
+    """
+    def __init__(self, path=MATCH_CHECKPOINT_FILE):
+        self.path = path
+        self._header = None
+        self._index = None
+
+    def begin(self, players, partners, k_partners, max_winners, split_rule, gold_bet, pot, difficulty, match_id,
+              rules=None):
+        ix = {name: i for i, name in enumerate(players)}
+        header = {
+            "version": 1,
+            "players": players,
+            "partners": [[ix[p] for p in partners.get(name, [])] for name in players],
+            "k_partners": k_partners,
+            "max_winners": max_winners,
+            "split_rule": split_rule,
+            "gold_bet": gold_bet,
+            "pot": pot,
+            "difficulty": difficulty,
+            "match_id": match_id,
+            "rules": rules or DEFAULT_RULES,
+        }
+        self._header = json.dumps(header, separators=(",", ":"))[:-1]
+        self._index = ix
+
+    def save(self, active_players, turn_order, elimination_order, next_round_starter_name, round_start_index,
+             turn_counter, match_memory, beaten, dice_counts=None):
+        ix = self._index
+        state = {
+            "active": [ix[n] for n in active_players],
+            "dice": [active_players[n] for n in active_players],
+            "dice_counts": [dice_counts[n] for n in active_players] if dice_counts is not None else None,
+            "turn_order": [ix[n] for n in turn_order],
+            "eliminated": [ix[n] for n in elimination_order],
+            "next_starter": ix.get(next_round_starter_name),
+            "round_start_index": round_start_index,
+            "turn_counter": turn_counter,
+            # only players who have done something this match
+            "memory": {str(ix[n]): [stats.get(k, 0) for k in BASE_STATS]
+                       for n, stats in match_memory.items() if n in ix and any(stats.values())},
+            "beaten": [ix[n] for n in beaten if n in ix],
+        }
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self._header)
+            f.write(',"state":')
+            f.write(json.dumps(state, separators=(",", ":")))
+            f.write("}")
+        os.replace(tmp, self.path)
+
+    def clear(self):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def load(path=MATCH_CHECKPOINT_FILE):
+        """The saved match with names restored, or None if there is no usable checkpoint."""
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+            players = raw["players"]
+            st = raw["state"]
+            match_memory = SeatStats(players)
+            for i, values in st["memory"].items():
+                match_memory.set(players[int(i)], values)
+            nxt = st["next_starter"]
+            rules = make_rules(**(raw.get("rules") or {}))
+            counts = st.get("dice_counts") or [rules["dice_per_player"]] * len(st["active"])
+            return {
+                "players": players,
+                "partners": {name: [players[j] for j in raw["partners"][i]] for i, name in enumerate(players)},
+                "k_partners": raw["k_partners"],
+                "max_winners": raw["max_winners"],
+                "split_rule": raw["split_rule"],
+                "gold_bet": raw["gold_bet"],
+                "pot": raw["pot"],
+                "difficulty": raw["difficulty"],
+                "match_id": raw["match_id"],
+                "active_players": {players[i]: d for i, d in zip(st["active"], st["dice"])},
+                "turn_order": deque(players[i] for i in st["turn_order"]),
+                "elimination_order": [players[i] for i in st["eliminated"]],
+                "next_round_starter_name": players[nxt] if nxt is not None else None,
+                "round_start_index": st["round_start_index"],
+                "turn_counter": st["turn_counter"],
+                "match_memory": match_memory,
+                "beaten": {players[i] for i in st["beaten"]},
+                "rules": rules,
+                "dice_counts": {players[i]: c for i, c in zip(st["active"], counts)},
+            }
+        except Exception:
+            return None
+
+# =========================
+# Event subscribers
+# =========================
+def attach_persistence(bus, global_memory, match_memory, every=40):
+    """Saves AI memory on challenges, credited bids, every `every` turns, and merges it at the end."""
+    def on_turn(ev):
+        if ev.number % every == 0:
+            save_ai_memory(global_memory)
+
+    def on_bid(ev):
+        if ev.credited:
+            save_ai_memory(global_memory)
+
+    def on_challenge(ev):
+        save_ai_memory(global_memory)
+
+    def on_end(ev):
+        merge_match_into_global(global_memory, match_memory)
+        save_ai_memory(global_memory)
+
+    return [bus.subscribe(TurnStarted, on_turn),
+            bus.subscribe(BidMade, on_bid),
+            bus.subscribe(ChallengeResolved, on_challenge),
+            bus.subscribe(MatchEnded, on_end)]
+
+def attach_achievements(bus, beaten, klare_data=None, difficulty="medium", ledger=None, human="Knight"):
+    """Collects the AIs the human outlasted into `beaten`, then klare_data / the ledger at match end."""
+    diff_key = f"{difficulty}_beaten"
+
+    def on_out(ev):
+        if ev.knight_alive and ev.name != human:
+            beaten.add(ev.name)
+
+    def on_end(ev):
+        if isinstance(klare_data, dict):
+            klare_data.setdefault(diff_key, [])
+            for name in sorted(beaten):
+                if name != human and name not in klare_data[diff_key]:
+                    klare_data[diff_key].append(name)
+        if ledger is not None:
+            with ledger.transaction():
+                for name in sorted(beaten):
+                    if name != human:
+                        ledger.beaten(human, diff_key, name)
+
+    return [bus.subscribe(PlayerOut, on_out), bus.subscribe(MatchEnded, on_end)]
+
+def attach_economy(bus, ledger):
+    """Records antes when a match starts (not when resumed) and every survivor's payout at the end."""
+    def on_start(ev):
+        if ev.resumed:
+            return
+        with ledger.transaction():
+            for name in ev.players:
+                ledger.bet(name, ev.gold_bet, match=ev.match_id)
+
+    def on_end(ev):
+        with ledger.transaction():
+            for name, gold in ev.payouts.items():
+                ledger.payout(name, gold, match=ev.match_id)
+
+    return [bus.subscribe(MatchStarted, on_start), bus.subscribe(MatchEnded, on_end)]
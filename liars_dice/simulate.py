@@ -0,0 +1,421 @@
+"""
+Headless all-AI matches, self-play tuning and match analytics. No terminal output or UI imports.
+"""
+import random
+import json
+import sys
+import time
+
+from .engine import (DEFAULT_RULES, SPOT_ON, BidRecord, EventBus, MatchEnded, MatchStarted, RoundHands, RoundStarted,
+                     SeatStats, TurnStarted, _ensure_ai, _pick_round_starter, _place_bid, _resolve_challenge, _roll_all,
+                     assign_partners, compute_payouts, merge_match_into_global, payout_rule, precompute_prob_tables)
+from .ai import AI_PARAMS, AI_PARAM_BOUNDS, HeuristicPolicy, OpponentModel, RoundAI
+
+# =========================
+# Headless simulation
+# =========================
+def simulate_match(seats, params=None, global_memory=None, opponent_model=None, rng=None, policies=None,
+                   gold_bet=None, rules=None, events=None):
+    """
+    Plays one all-AI match with no output, pacing or file writes and returns its result.
+
+    seats: list of (name, difficulty) pairs
+    params: per-difficulty AI parameters (AI_PARAMS when None)
+    policies: per-difficulty policy objects; heuristic policies over `params` when None
+    gold_bet: when given, the result also carries every survivor's payout of the pot
+    rules: see make_rules()
+    global_memory: stats dict to read and update in place (fresh when None)
+    opponent_model: OpponentModel to read and update; pass the same one to a series of
+                    matches so its decayed reads carry over (fresh when None)
+    events: an EventBus to deliver the match's events to; only subscribed types are built
+    """
+    rng = rng or random
+    if policies is None:
+        params = params or AI_PARAMS
+        policies = {d: HeuristicPolicy(d, params.get(d)) for d in AI_PARAMS}
+    names = [name for name, _ in seats]
+    seat_diff = dict(seats)
+
+    partners, k_partners, max_winners, split_rule = assign_partners(names, rng=rng)
+    if global_memory is None:
+        global_memory = {}
+    for name in names:
+        _ensure_ai(global_memory, name)
+    match_memory = SeatStats(names)
+    if opponent_model is None:
+        opponent_model = OpponentModel()
+
+    rules = rules or DEFAULT_RULES
+    active_players = {name: [] for name in names}
+    dice_counts = {name: rules["dice_per_player"] for name in names}
+    total_dice = sum(dice_counts.values())
+    if total_dice <= 512:
+        precompute_prob_tables(total_dice, rules)
+    elimination_order = []
+    turn_order = names[:]
+    rng.shuffle(turn_order)
+    seat_pos = {name: i for i, name in enumerate(turn_order)}
+    seat_policy = {name: policies[seat_diff[name]] for name in names}
+    last_bid = BidRecord()
+    next_round_starter_name = None
+    round_start_index = 0
+    rounds = 0
+    turns = 0
+
+    bus = events
+    want = {t: bus is not None and bus.wants(t)
+            for t in (RoundStarted, TurnStarted, MatchEnded)}
+    if bus is not None and bus.wants(MatchStarted):
+        bus.emit(MatchStarted(None, names, (gold_bet or 0) * len(names), gold_bet, rules, False))
+
+    while len(active_players) > max_winners:
+        rounds += 1
+        starter, round_start_index = _pick_round_starter(turn_order, active_players, next_round_starter_name,
+                                                         round_start_index, seat_pos)
+        pos = seat_pos[starter]
+        if want[RoundStarted]:
+            bus.emit(RoundStarted(rounds, starter, total_dice))
+
+        face_totals = _roll_all(active_players, dice_counts, rng)
+        round_ai = RoundAI(RoundHands(active_players, partners, rules), total_dice, partners, global_memory,
+                           opponent_model, rng, rules)
+        # nobody leaves mid-round, so the living seats are listed once, starting with the starter
+        seating = [(name, seat_policy[name]) for name in turn_order[pos:] + turn_order[:pos]
+                   if name in active_players]
+
+        current_bid = None
+        current_bidder = None
+        last_bid.clear()
+        round_over = False
+        while not round_over:
+            for player, policy in seating:
+                turns += 1
+                if want[TurnStarted]:
+                    bus.emit(TurnStarted(turns, player))
+
+                result_bid, result_bidder, wants_reveal, caller = round_ai.turn(player, policy, current_bid,
+                                                                                current_bidder)
+
+                if wants_reveal:
+                    caller_this_round = caller or player
+                    loser, lost, out = _resolve_challenge(caller_this_round, current_bidder, current_bid,
+                                                          wants_reveal == SPOT_ON, face_totals, active_players,
+                                                          dice_counts, last_bid, global_memory, match_memory,
+                                                          opponent_model, rules, bus)
+                    total_dice -= lost
+                    if out:
+                        elimination_order.append(loser)
+                    next_round_starter_name = caller_this_round
+                    round_over = True
+                    break
+
+                current_bid = result_bid
+                current_bidder = result_bidder
+                qty2, face2 = current_bid
+                _place_bid(last_bid, result_bidder, qty2, face2, face_totals, global_memory, opponent_model, rules, bus)
+
+    merge_match_into_global(global_memory, match_memory)
+    survivors = list(active_players.keys())
+
+    result = {
+        "players": names,
+        "difficulty": seat_diff,
+        "turn_order": turn_order,
+        "partners": partners,
+        "group_size": k_partners + 1,
+        "max_winners": max_winners,
+        "split_rule": split_rule,
+        "survivors": survivors,
+        "elimination_order": elimination_order,
+        "rounds": rounds,
+    }
+    if gold_bet is not None:
+        result["pot"] = gold_bet * len(names)
+        result["payouts"] = compute_payouts(result["pot"], survivors, partners, split_rule, lead=None)
+    if want[MatchEnded]:
+        bus.emit(MatchEnded(None, survivors, elimination_order, result.get("payouts", {})))
+    return result
+
+# =========================
+# Self-play tuning
+# =========================
+# share of the surviving seats each difficulty should take at a mixed table
+DEFAULT_TARGET_SHARE = {"easy": 0.20, "medium": 0.33, "hard": 0.47}
+
+def _mixed_seats(table_size):
+    diffs = ("easy", "medium", "hard")
+    return [(f"AI {i+1}", diffs[i % 3]) for i in range(max(3, table_size))]
+
+# parameters that only matter under one rule; the tuner leaves them alone unless that rule is in play
+_RULE_ONLY_PARAMS = {"spot_on_threshold": "spot_on"}
+
+def _tune_batch(job):
+    """Worker: plays a chunk of seeded matches for one candidate and counts survivors per difficulty."""
+    cand_idx, params, table_size, seeds, rules = job
+    survived = {"easy": 0, "medium": 0, "hard": 0}
+    # a candidate is scored against opponents that have been reading it all chunk
+    model = OpponentModel()
+    for seed in seeds:
+        result = simulate_match(_mixed_seats(table_size), params=params, rng=random.Random(seed),
+                                opponent_model=model, rules=rules)
+        for name in result["survivors"]:
+            survived[result["difficulty"][name]] += 1
+    return cand_idx, survived
+
+def _survivor_share(survived):
+    total = max(1, sum(survived.values()))
+    return {d: survived[d] / total for d in survived}
+
+def _mutate_params(params, rng, scale, rules=None):
+    rules = rules or DEFAULT_RULES
+    bounds = [(k, b) for k, b in AI_PARAM_BOUNDS.items()
+              if k not in _RULE_ONLY_PARAMS or rules.get(_RULE_ONLY_PARAMS[k])]
+    child = {d: dict(v) for d, v in params.items()}
+    for d in child:
+        for k, (lo, hi) in bounds:
+            if rng.random() < 0.3:
+                child[d][k] = min(hi, max(lo, child[d][k] + rng.gauss(0.0, scale * (hi - lo))))
+        if child[d]["conf_low"] > child[d]["conf_high"]:
+            child[d]["conf_low"], child[d]["conf_high"] = child[d]["conf_high"], child[d]["conf_low"]
+    return child
+
+def tune_ai_params(generations=15, population=8, matches=300, table_size=9, targets=None, workers=None,
+                   seed=0, start=None, chunk=25, rules=None, log=print):
+    """
+    Evolutionary (1+lambda) search over AI_PARAM_BOUNDS using headless self-play.
+
+    Each generation mutates the best parameter set `population` times, plays every
+    candidate on the same seeded mixed-difficulty tables across `workers` processes,
+    and keeps whichever lands closest to `targets` (share of survivors per difficulty).
+    Matches are played under `rules`; parameters only those rules use are mutated.
+    With generations < 1 the starting parameters are only scored.
+    Returns (best_params, best_share, best_loss).
+    """
+    import multiprocessing
+
+    targets = targets or DEFAULT_TARGET_SHARE
+    rng = random.Random(seed)
+    best = {d: dict(v) for d, v in (start or AI_PARAMS).items()}
+    scale = 0.15
+
+    def loss_of(share):
+        return sum((share[d] - targets[d]) ** 2 for d in targets)
+
+    with multiprocessing.Pool(workers) as pool:
+        def evaluate(candidates, gen_seed):
+            # common random numbers: every candidate sees the same tables
+            seeds = [gen_seed * 1000003 + i for i in range(matches)]
+            jobs = [(ci, c, table_size, seeds[i:i + chunk], rules)
+                    for ci, c in enumerate(candidates) for i in range(0, len(seeds), chunk)]
+            survived = [{"easy": 0, "medium": 0, "hard": 0} for _ in candidates]
+            for ci, counts in pool.imap_unordered(_tune_batch, jobs):
+                for d, n in counts.items():
+                    survived[ci][d] += n
+            return [_survivor_share(x) for x in survived]
+
+        for gen in range(generations):
+            candidates = [best] + [_mutate_params(best, rng, scale, rules) for _ in range(population)]
+            shares = evaluate(candidates, seed + gen)
+            losses = [loss_of(sh) for sh in shares]
+            i_best = min(range(len(candidates)), key=losses.__getitem__)
+            if i_best == 0:
+                scale = max(0.02, scale * 0.8)
+            best, best_share, best_loss = candidates[i_best], shares[i_best], losses[i_best]
+            log(f"gen {gen+1}/{generations}  loss {best_loss:.5f}  " +
+                "  ".join(f"{d} {best_share[d]:.3f}" for d in ("easy", "medium", "hard")))
+        if generations < 1:
+            # nothing to search: just score the starting parameters
+            best_share = evaluate([best], seed)[0]
+            best_loss = loss_of(best_share)
+            log(f"start  loss {best_loss:.5f}  " +
+                "  ".join(f"{d} {best_share[d]:.3f}" for d in ("easy", "medium", "hard")))
+    return best, best_share, best_loss
+
+# =========================
+# Match analytics
+# =========================
+def _rule_payout(pot, seat, survivors, partners, split_rule):
+    """(gold, rule) that `seat` takes home if it were the Knight, (0, None) if it lost."""
+    if seat not in survivors:
+        return 0, None
+    rule = payout_rule(survivors, partners, split_rule, lead=seat)[0]
+    return compute_payouts(pot, survivors, partners, split_rule, lead=seat)[seat], rule
+
+def compact_result(result):
+    """The parts of a simulate_match result the report needs, small enough to store one per line."""
+    survivors = result["survivors"]
+    surv_set = set(survivors)
+    return {
+        "order": [result["difficulty"][n] for n in result["turn_order"]],
+        "survivors": [result["turn_order"].index(n) for n in survivors],
+        "survivor_partners": {str(result["turn_order"].index(n)): [result["turn_order"].index(p)
+                                                                   for p in result["partners"].get(n, [])
+                                                                   if p in surv_set]
+                              for n in survivors},
+        "group_size": result["group_size"],
+        "split_rule": result["split_rule"],
+        "rounds": result["rounds"],
+    }
+
+class MatchStats:
+    """
+    Streaming aggregate over compact match results. Everything is a running
+    counter, so memory stays constant however many matches are fed in.
+    """
+    def __init__(self, gold_bet=1):
+        self.gold_bet = gold_bet
+        self.matches = 0
+        self.rounds = 0
+        self.by_diff = {}    # difficulty -> [seats, wins, gold]
+        self.by_pos = {}     # turn-order decile -> [seats, wins]
+        self.by_group = {}   # partner group size -> [seats, wins]
+        self.by_rule = {}    # payout rule -> [payouts, gold the seat would take as the Knight]
+
+    def add(self, res):
+        order = res["order"]
+        n = len(order)
+        pot = self.gold_bet * n
+        survivors = res["survivors"]
+        partners = {int(k): v for k, v in res["survivor_partners"].items()}
+        group = res["group_size"]
+        self.matches += 1
+        self.rounds += res["rounds"]
+
+        won = set(survivors)
+        # EV uses what each seat is really paid; the per-rule table values a seat as the Knight
+        paid = compute_payouts(pot, survivors, partners, res["split_rule"], lead=None)
+        for pos, d in enumerate(order):
+            win = 1 if pos in won else 0
+            row = self.by_diff.setdefault(d, [0, 0, 0])
+            row[0] += 1
+            row[1] += win
+            row[2] += paid.get(pos, 0)
+            row = self.by_pos.setdefault(pos * 10 // n, [0, 0])
+            row[0] += 1
+            row[1] += win
+            row = self.by_group.setdefault(group, [0, 0])
+            row[0] += 1
+            row[1] += win
+            if win:
+                gold, rule = _rule_payout(pot, pos, survivors, partners, res["split_rule"])
+                row = self.by_rule.setdefault(rule, [0, 0])
+                row[0] += 1
+                row[1] += gold
+
+    def report(self):
+        bet = self.gold_bet
+        lines = [f"Matches: {self.matches}",
+                 f"Average rounds per match: {self.rounds / max(1, self.matches):.2f}",
+                 "",
+                 "Win rate by difficulty (gold EV is net return per gold bet):"]
+        for d in sorted(self.by_diff):
+            seats, wins, gold = self.by_diff[d]
+            lines.append(f"  {d:<8} {wins / max(1, seats):7.2%}  EV {gold / max(1, seats * bet) - 1:+.3f}  ({seats} seats)")
+        lines.append("\nWin rate by turn-order position:")
+        for b in sorted(self.by_pos):
+            seats, wins = self.by_pos[b]
+            lines.append(f"  {b * 10:>3}-{b * 10 + 10:<3}%  {wins / max(1, seats):7.2%}  ({seats} seats)")
+        lines.append("\nWin rate by partner group size:")
+        for g in sorted(self.by_group):
+            seats, wins = self.by_group[g]
+            lines.append(f"  {g}  {wins / max(1, seats):7.2%}  ({seats} seats)")
+        lines.append("\nPayout rules, each survivor valued as if it were the Knight "
+                     "(average gold per gold bet when paid):")
+        for rule in ("50/50", "75/25", "34/33/33", "25x4", "even"):
+            if rule in self.by_rule:
+                paid, gold = self.by_rule[rule]
+                lines.append(f"  {rule:<9} {gold / max(1, paid * bet):7.3f}x  ({paid} payouts)")
+        return "\n".join(lines)
+
+def _report_batch(job):
+    sizes, seeds, rules = job
+    out = []
+    # report the stock AI as a session plays it, reads built up over earlier matches
+    model = OpponentModel()
+    for seed in seeds:
+        seats = _mixed_seats(sizes[seed % len(sizes)])
+        out.append(compact_result(simulate_match(seats, rng=random.Random(seed), rules=rules,
+                                                 opponent_model=model)))
+    return out
+
+def iter_simulated_results(matches, sizes=(9,), seed=0, workers=None, chunk=50, rules=None):
+    """Yields compact results of freshly simulated mixed-difficulty matches, in seed order."""
+    import multiprocessing
+
+    jobs = ((tuple(sizes), range(i, min(i + chunk, seed + matches)), rules)
+            for i in range(seed, seed + matches, chunk))
+    with multiprocessing.Pool(workers) as pool:
+        for batch in pool.imap(_report_batch, jobs):
+            yield from batch
+
+def iter_saved_results(path):
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+# =========================
+# Stress runs
+# =========================
+STRESS_SIZES = (1000, 10000)
+
+def peak_rss_mb():
+    """This process's peak resident set size in MB, or None where the platform can't say."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def _percentile(ordered, q):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+def stress_match(seats, seed=0, rules=None):
+    """
+    One headless match on a synthetic roster of `seats` AIs, timed round by round.
+
+    Returns seats, rounds, total seconds, per-round latency percentiles (ms) and
+    the process's peak RSS; run each size in a fresh process (run_stress does)
+    so the peak belongs to that size alone.
+    """
+    bus = EventBus()
+    marks = []
+    bus.subscribe(RoundStarted, lambda ev: marks.append(time.perf_counter()))
+    roster = _mixed_seats(seats)
+    t0 = time.perf_counter()
+    result = simulate_match(roster, rng=random.Random(seed), rules=rules, events=bus)
+    t1 = time.perf_counter()
+    marks.append(t1)
+    rounds_ms = sorted((b - a) * 1000 for a, b in zip(marks, marks[1:]))
+    return {
+        "seats": seats,
+        "rounds": result["rounds"],
+        "total_s": t1 - t0,
+        "round_ms": {"p50": _percentile(rounds_ms, 0.50), "p90": _percentile(rounds_ms, 0.90),
+                     "p99": _percentile(rounds_ms, 0.99), "max": rounds_ms[-1] if rounds_ms else 0.0},
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+def _stress_job(job):
+    return stress_match(*job)
+
+def run_stress(sizes=STRESS_SIZES, seed=0, rules=None, log=print):
+    """Runs stress_match for each size in its own worker process and logs one line per size."""
+    from multiprocessing import get_context
+
+    reports = []
+    log(f"{'seats':>7} {'rounds':>7} {'total s':>9} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8} "
+        f"{'peak RSS MB':>12}")
+    for seats in sizes:
+        with get_context().Pool(1, maxtasksperchild=1) as pool:
+            rep = pool.apply(_stress_job, ((seats, seed, rules),))
+        rm = rep["round_ms"]
+        rss = f"{rep['peak_rss_mb']:.1f}" if rep["peak_rss_mb"] is not None else "n/a"
+        log(f"{rep['seats']:>7} {rep['rounds']:>7} {rep['total_s']:>9.2f} {rm['p50']:>8.2f} {rm['p90']:>8.2f} "
+            f"{rm['p99']:>8.2f} {rm['max']:>8.2f} {rss:>12}")
+        reports.append(rep)
+    return reports
+
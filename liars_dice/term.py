@@ -0,0 +1,51 @@
+"""
+Terminal output helpers shared by the AI dialogue and the interactive game.
+"""
+import os
+import time
+
+# =========================
+# ANSI COLOURS
+# =========================
+GREEN = "\033[92m"
+RESET = "\033[0m"
+
+# =========================
+# Utilities
+# =========================
+def clear_cmd():
+    os.system("cls" if os.name == "nt" else "clear")
+
+def Print(text, delay=0.03, newline=True):
+    for c in str(text):
+        print(c, end="", flush=True)
+        time.sleep(delay)
+    if newline:
+        print()
+
+def press_to_continue(msg="\nPress Enter to continue: "):
+    try:
+        input(msg)
+    except EOFError:
+        pass
+
+def render_turn_order(order, active_set, current, fast=False):
+    """Single-line turn order, removes eliminated, highlights current in green."""
+    seq = []
+    seen = set()
+    for name in list(order):
+        if name in seen:
+            continue
+        seen.add(name)
+        if name not in active_set:
+            continue
+        if name == current:
+            seq.append(f"{GREEN}{name}{RESET}")
+        else:
+            seq.append(name)
+    line = " -> ".join(seq)
+    if fast:
+        print(line)
+    else:
+        Print(line)
+    return line
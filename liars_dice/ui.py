@@ -0,0 +1,715 @@
+"""
+The interactive terminal game: the Knight's match loop, menus and help screens.
+"""
+import random
+import time
+import os
+from collections import deque
+
+from .engine import (DEFAULT_RULES, SPOT_ON, BidRecord, ChallengeResolved, DieLost, EventBus, MatchEnded,
+                     MatchStarted, PlayerOut, RoundHands, RoundStarted, SeatStats, TurnStarted, _pick_round_starter,
+                     _place_bid, _resolve_challenge, _roll_all, assign_partners, compute_payouts, detach, make_rules,
+                     payout_rule, precompute_prob_tables)
+from .ai import RoundAI, load_ai_policies, shared_opponent_model, table_talk
+from .persistence import (BEATEN_KEYS, MATCH_CHECKPOINT_FILE, Ledger, MatchCheckpoint, _Preload, _take_ai_memory,
+                          attach_achievements, attach_economy, attach_persistence, preload_ai_memory)
+from .term import clear_cmd, Print, press_to_continue, render_turn_order
+
+# =========================
+# Rendering
+# =========================
+def attach_renderer(bus):
+    """Prints reveals and eliminations the way the table always has (fast at 15+ players)."""
+    def on_challenge(ev):
+        out = print if len(ev.hands) >= 15 else Print
+        out("\n--- ALL DICE REVEALED ---")
+        for name, dice in ev.hands.items():
+            out(f"{name}: {dice}")
+        out("--------------------------\n")
+        msg = f"The bid was {ev.qty} {ev.face}'s, there are {ev.actual} {ev.face}'s."
+        if ev.rules["wild_ones"] and ev.face != 1:
+            msg += " (1s are wild)"
+        out(msg)
+
+    def on_out(ev):
+        (print if ev.players_left >= 15 else Print)(f"{ev.name} {ev.verdict} and is OUT!")
+
+    def on_die_lost(ev):
+        (print if ev.players_left >= 15 else Print)(f"{ev.name} {ev.verdict} and loses a die ({ev.dice_left} left).")
+
+    return [bus.subscribe(ChallengeResolved, on_challenge),
+            bus.subscribe(PlayerOut, on_out),
+            bus.subscribe(DieLost, on_die_lost)]
+
+# Main game loic
+def play_liars_dice(player_data, klare_data, enemy_count, difficulty, enemy_names, gold_bet=None, silent=False,
+                    opponent_model=None, ledger=None, checkpoint=None, resume=False, rules=None, events=None):
+    """
+    opponent_model: the AI's opponent reads; the process-wide shared_opponent_model() when None
+    events: an EventBus to also deliver this match's events to (telemetry, broadcasting, ...);
+            rendering, AI memory saves, achievements and the ledger are subscribed here
+    rules: see make_rules(); the standard one-challenge-and-out game when None
+    checkpoint: file to snapshot the match to at every round boundary (removed when it ends)
+    resume: continue the match saved in `checkpoint` instead of starting a new one;
+            the bet was already taken, so no gold or ledger antes are charged again.
+            Without a readable snapshot nothing is played and the data comes back as given
+    """
+    snap = MatchCheckpoint.load(checkpoint) if checkpoint and resume else None
+    if resume and snap is None:
+        if not silent:
+            Print("\nThe saved match could not be read, so there is nothing to resume.")
+        return player_data, klare_data
+    diff = str(snap["difficulty"] if snap else difficulty).strip().lower()
+    if diff not in ("easy", "medium", "hard"):
+        diff = "medium"
+
+    # for 15+ players we will prefer fast printing in some places
+    def fast_print(*args, **kwargs):
+        if not silent:
+            print(*args, **kwargs)
+
+    def slow_or_fast_print(text):
+        if silent:
+            return
+        Print(text)
+
+    if snap is not None:
+        players = snap["players"]
+        total_players = len(players)
+        gold_bet = snap["gold_bet"]
+        pot = snap["pot"]
+        match_id = snap["match_id"]
+        active_players = snap["active_players"]
+        partners, k_partners = snap["partners"], snap["k_partners"]
+        max_winners, split_rule = snap["max_winners"], snap["split_rule"]
+        match_memory = snap["match_memory"]
+        beaten_this_game = snap["beaten"]
+        elimination_order = snap["elimination_order"]
+        turn_order = snap["turn_order"]
+        next_round_starter_name = snap["next_round_starter_name"]
+        round_start_index = snap["round_start_index"]
+        turn_counter = snap["turn_counter"]
+        rules = snap["rules"]
+        dice_counts = snap["dice_counts"]
+        slow_or_fast_print(f"\nResuming your match at a table of {len(players)}, "
+                           f"{len(active_players)} players still in, pot {pot}.\n")
+    else:
+        if gold_bet is None:
+            while True:
+                try:
+                    gold_bet = int(input("Enter your gold bet per player: ").strip())
+                    if gold_bet > 0:
+                        break
+                    Print("Enter a positive integer.")
+                except ValueError:
+                    Print("That is not a number, try again.")
+
+        enemy_count = max(1, int(enemy_count))
+        enemy_names = list(enemy_names or [])
+        enemy_names = enemy_names[:enemy_count]
+        while len(enemy_names) < enemy_count:
+            enemy_names.append(f"Opponent {len(enemy_names)+1}")
+        players = ["Knight"] + enemy_names[:enemy_count]
+        total_players = len(players)
+
+        if player_data.get("gold", 0) < gold_bet:
+            Print("You do not have enough gold to make that bet.")
+            return player_data, klare_data
+        player_data["gold"] -= gold_bet
+        pot = gold_bet * len(players)
+        match_id = f"{int(time.time() * 1000)}-{random.randrange(1 << 16):04x}"
+
+        active_players = {name: [] for name in players}
+        rules = rules or DEFAULT_RULES
+        dice_counts = {name: rules["dice_per_player"] for name in players}
+
+        partners, k_partners, max_winners, split_rule = assign_partners(players)
+
+        match_memory = SeatStats(players)
+
+        beaten_this_game = set()
+        elimination_order = []
+        turn_order = deque(players)
+        random.shuffle(turn_order)
+        next_round_starter_name = None
+        round_start_index = 0
+        turn_counter = 0
+
+        slow_or_fast_print(f"\nYou sit at a crowded tavern table with {len(players)} players.")
+        slow_or_fast_print(f"Each player antes {gold_bet} gold, total pot is {pot}.")
+        if max_winners == 2:
+            slow_or_fast_print("Top 2 split the pot, if you and your partner are the final two, you receive 75 percent, your partner 25 percent.\n")
+        elif max_winners == 3:
+            slow_or_fast_print("Top 3 can win this match, pot splits 34/33/33.\n")
+        else:
+            slow_or_fast_print("Top 4 can win this match, pot splits 25/25/25/25.\n")
+
+    global_memory = _take_ai_memory(players)
+    if opponent_model is None:
+        opponent_model = shared_opponent_model()
+    ai_policy = load_ai_policies()[diff]
+
+    saver = None
+    if checkpoint:
+        saver = MatchCheckpoint(checkpoint)
+        saver.begin(players, partners, k_partners, max_winners, split_rule, gold_bet, pot, diff, match_id, rules)
+    total_dice = sum(dice_counts.values())
+    if total_dice <= 512:
+        precompute_prob_tables(total_dice, rules)
+
+    # side effects hang off the event bus; the loop below only emits
+    bus = events if events is not None else EventBus()
+    handles = attach_persistence(bus, global_memory, match_memory)
+    handles += attach_achievements(bus, beaten_this_game, klare_data, diff, ledger)
+    if ledger is not None:
+        handles += attach_economy(bus, ledger)
+    renderer = attach_renderer(bus) if not silent else []
+    # the caller may reuse its bus for the next match; leave it as we found it
+    try:
+        if bus.wants(MatchStarted):
+            bus.emit(MatchStarted(match_id, players, pot, gold_bet, rules, snap is not None))
+        round_number = 0
+        last_bid = BidRecord()
+
+        def settle_challenge(caller, bidder, bid, spot_on):
+            """Resolves a call on `bidder`'s bid and takes the loss off this match's tallies."""
+            nonlocal total_dice
+            loser, lost, out = _resolve_challenge(caller, bidder, bid, spot_on, face_totals, active_players,
+                                                  dice_counts, last_bid, global_memory, match_memory,
+                                                  opponent_model, rules, bus)
+            total_dice -= lost
+            if out:
+                elimination_order.append(loser)
+
+        # Watching / skipping controls after Knight elimination
+        skip_to_results = False
+
+        # main rounds
+        while len(active_players) > max_winners:
+            if saver is not None:
+                saver.save(active_players, turn_order, elimination_order, next_round_starter_name, round_start_index,
+                           turn_counter, match_memory, beaten_this_game, dice_counts)
+            ordered_all = list(turn_order)
+            alive_set = set(active_players.keys())
+
+            starter, round_start_index = _pick_round_starter(ordered_all, alive_set, next_round_starter_name,
+                                                             round_start_index)
+            next_round_starter_name = None
+
+            start_pos = ordered_all.index(starter)
+            round_order = deque(ordered_all[start_pos:] + ordered_all[:start_pos])
+            round_number += 1
+            if bus.wants(RoundStarted):
+                bus.emit(RoundStarted(round_number, starter, total_dice))
+
+            if not silent:
+                press_to_continue("Press Enter to roll dice and begin the round: ")
+                clear_cmd()
+
+            use_fast = len(active_players) >= 15
+            render_turn_order(round_order, alive_set, starter, fast=use_fast)
+
+            # Roll dice; face totals are counted once here and reused for every bid this round
+            face_totals = _roll_all(active_players, dice_counts)
+            round_ai = RoundAI(RoundHands(active_players, partners, rules), total_dice, partners, global_memory,
+                               opponent_model, rules=rules, quiet=silent)
+
+            if "Knight" in active_players:
+                pd = active_players["Knight"]
+                partner_names = partners.get("Knight", [])
+
+                # Build partner dice text dynamically
+                partner_texts = []
+                for pn in partner_names:
+                    if pn in active_players:  # Partner still alive
+                        partner_dice = active_players[pn]
+                        partner_texts.append(f"{pn}'s Dice: {partner_dice}")
+
+                # Decide what to print based on how many partners are alive
+                if partner_texts:
+                    msg = "Your Dice: {} | {}".format(pd, " | ".join(partner_texts))
+                else:
+                    msg = f"Your Dice: {pd}"
+
+                # Print using correct style depending on player count
+                if len(active_players) >= 15:
+                    print(msg)
+                else:
+                    Print(msg)
+
+
+            current_bid = None
+            current_bidder = None
+            round_over = False
+            if use_fast:
+                fast_print(f"\n{starter} starts the round.")
+            else:
+                slow_or_fast_print(f"\n{starter} starts the round.")
+            caller_this_round = None
+
+            # Track last-bid info only for success crediting; we no longer record "made" counters separately
+            last_bid.clear()
+            bids_in_round = 0
+
+            while not round_over:
+                for _ in range(len(round_order)):
+                    if round_over:
+                        break
+                    player = round_order[0]
+                    round_order.rotate(-1)
+                    if player not in active_players:
+                        continue
+
+                    turn_counter += 1
+                    if bus.wants(TurnStarted):
+                        bus.emit(TurnStarted(turn_counter, player))
+
+                    total_players_left = len(active_players)
+
+                    if player == "Knight":
+                        if "Knight" not in active_players:
+                            continue  # safety
+
+                        while True and not silent:
+                            current_bid_text = f"{current_bid[0]} {current_bid[1]}'s" if current_bid else "No bids yet"
+                            partner_names = partners.get("Knight", [])
+                            partner_dice_flat = []
+                            for pn in partner_names:
+                                if pn in active_players:
+                                    partner_dice_flat.extend(active_players[pn])
+
+                            Print("\n---------------------------")
+
+                            # Show Knight's and partners' dice
+                            pd = active_players["Knight"]
+                            partner_names = partners.get("Knight", [])
+
+                            partner_texts = []
+                            for pn in partner_names:
+                                if pn in active_players:  # Only show surviving partners
+                                    partner_dice = active_players[pn]
+                                    partner_texts.append(f"{pn}'s Dice: {partner_dice}")
+
+                            if partner_texts:
+                                msg = "Your Dice: {} | {}".format(pd, " | ".join(partner_texts))
+                            else:
+                                msg = f"Your Dice: {pd}"
+
+                            if len(active_players) >= 15:
+                                print(msg)
+                            else:
+                                Print(msg)
+
+                            Print(f"Players Left: {total_players_left} | Total Dice: {total_dice}")
+                            Print(f"Current Bid: {current_bid_text}")
+                            Print("[1] Up Bid")
+                            Print("[2] Call Bluff")
+                            if rules["spot_on"]:
+                                Print("[3] Spot On")
+                            action = input("Enter: ").strip()
+                            Print("---------------------------")
+
+                            if action not in (("1", "2", "3") if rules["spot_on"] else ("1", "2")):
+                                if rules["spot_on"]:
+                                    Print("Invalid choice, Enter 1 to Up Bid, 2 to Call Bluff or 3 for Spot On.")
+                                else:
+                                    Print("Invalid choice, Enter 1 to Up Bid or 2 to Call Bluff.")
+                                continue
+
+                            if action in ("2", "3"):
+                                if not current_bid or not current_bidder:
+                                    Print("\nNo bid to call bluff on.")
+                                    continue
+
+                                qty, face = current_bid
+                                caller_this_round = "Knight"
+                                spot_on = action == "3"
+                                if spot_on:
+                                    Print(f"\n[Knight] Spot on, there are exactly {qty} {face}'s.")
+                                else:
+                                    Print(f"\n[Knight] I am calling your {current_bid[0]} {current_bid[1]}'s.")
+
+                                settle_challenge(caller_this_round, current_bidder, current_bid, spot_on)
+                                next_round_starter_name = caller_this_round
+                                round_over = True
+                                break
+
+                            else:
+                                # Knight raises
+                                while True:
+                                    bet = input("Enter Bid as 'quantity' of 'face' (eg. 3 4): ").strip().split()
+                                    if len(bet) != 2 or not all(x.isdigit() for x in bet):
+                                        Print("Invalid format, example: 3 4")
+                                        continue
+                                    qty, face = map(int, bet)
+                                    if not (1 <= face <= 6):
+                                        Print("Face must be 1–6.")
+                                        continue
+                                    if qty < 2 and not current_bid:
+                                        Print("Minimum opening bid is 2 of a kind.")
+                                        continue
+                                    if current_bid and (qty < current_bid[0] or (qty == current_bid[0] and face <= current_bid[1])):
+                                        Print("Bid must be higher than current.")
+                                        continue
+                                    if qty > total_dice:
+                                        Print(f"Quantity too high, max is {total_dice}.")
+                                        continue
+
+                                    current_bid = (qty, face)
+                                    current_bidder = "Knight"
+                                    bids_in_round += 1
+                                    # credits the bid raised over, if nobody called it
+                                    _place_bid(last_bid, "Knight", qty, face, face_totals, global_memory, opponent_model,
+                                               rules, bus)
+
+                                    Print(f"\nKnight bids {qty} dice of {face}'s.")
+                                    break
+                                break
+
+                    else:
+                        result_bid, result_bidder, wants_reveal, caller = round_ai.turn(player, ai_policy, current_bid,
+                                                                                        current_bidder)
+
+                        if wants_reveal:
+                            caller_this_round = caller or player
+                            spot_on = wants_reveal == SPOT_ON
+                            qty, face = current_bid
+                            # Bluff call line remains slow Print for drama
+                            if silent:
+                                pass
+                            elif spot_on:
+                                Print(f"\n[{caller_this_round}] Spot on. Exactly {qty} {face}'s, not one more.\n")
+                            else:
+                                Print(f"\n{random.choice(table_talk['call_bluff']).format(name=caller_this_round)}\n")
+
+                            settle_challenge(caller_this_round, current_bidder, current_bid, spot_on)
+                            next_round_starter_name = caller_this_round
+                            round_over = True
+                            break
+
+                        else:
+                            # AI raises; credit previous unresolved bid with success
+                            current_bid = result_bid
+                            current_bidder = result_bidder
+                            bids_in_round += 1
+                            qty2, face2 = current_bid
+                            _place_bid(last_bid, result_bidder, qty2, face2, face_totals, global_memory, opponent_model,
+                                       rules, bus)
+
+            if not silent:
+                press_to_continue()
+                clear_cmd()
+
+            # If Knight just got eliminated, offer skip option once
+            if "Knight" not in active_players and not skip_to_results and not silent:
+                Print("\nYou have been eliminated.")
+                Print("[1] Watch the rest")
+                Print("[2] Skip to final results")
+                choice = input("Enter: ").strip()
+                if choice == "2":
+                    skip_to_results = True
+                    silent = True  # suppress all drama/pauses going forward
+                    detach(bus, renderer)
+
+        if saver is not None:
+            saver.clear()
+        survivors = list(active_players.keys())
+        slow_or_fast_print("\nFinal survivors reached.\n")
+
+        # Show partner pairs (compact)
+        if not silent:
+            Print("Partner pairs this match:")
+            seen = set()
+            for a in players:
+                if a in seen:
+                    continue
+                ps = partners.get(a, [])
+                group = [a] + ps
+                for g in group:
+                    seen.add(g)
+                Print(f"{a} ↔ {', '.join(ps) if ps else '-'}")
+
+            Print("\nElimination order (first out -> last out):")
+            Print(", ".join(elimination_order + survivors))
+
+        # Payouts
+        payouts = compute_payouts(pot, survivors, partners, split_rule, lead="Knight")
+        rule = payout_rule(survivors, partners, split_rule, lead="Knight")[0]
+        if "Knight" in survivors:
+            knight_reward = payouts["Knight"]
+            player_data["gold"] += knight_reward
+            if rule == "75/25":
+                # special 75/25 if Knight and a partner are the last two
+                other = [s for s in survivors if s != "Knight"][0]
+                slow_or_fast_print(f"\nKnight and partner {other} survive together.")
+                slow_or_fast_print(f"Knight receives {knight_reward} gold, {other} receives {payouts[other]} gold.")
+            elif rule == "50/50":
+                slow_or_fast_print(f"\nKnight survives to the final two and receives {knight_reward} gold.")
+            elif rule == "34/33/33":
+                slow_or_fast_print(f"\nThree winners. Knight receives {knight_reward} gold by rule (34/33/33).")
+            elif rule == "25x4":
+                slow_or_fast_print(f"\nFour winners. Knight receives {knight_reward} gold by rule (25% each).")
+            else:
+                slow_or_fast_print(f"\nMultiple survivors. Knight receives {knight_reward} gold by rule.")
+        else:
+            slow_or_fast_print("\nKnight did not make the final group. No gold awarded.")
+        others = [f"{name} {gold}" for name, gold in payouts.items() if name != "Knight"]
+        if others and rule != "75/25":
+            slow_or_fast_print(f"Other payouts: {', '.join(others)} gold.")
+
+        if bus.wants(MatchEnded):
+            bus.emit(MatchEnded(match_id, survivors, elimination_order, payouts))
+
+        if not silent:
+            Print("\nSummary:")
+            Print(f"  • Players total: {len(players)}")
+            Print(f"  • Pot: {pot} gold")
+            Print(f"  • Knight final gold: {player_data.get('gold', 0)}")
+            beaten_list = ", ".join(sorted(beaten_this_game)) if beaten_this_game else "None"
+            Print(f"  • Beaten AIs this match: {beaten_list}")
+
+        return player_data, klare_data
+    finally:
+        detach(bus, handles + renderer)
+
+# Klare data placeholder when this file is main
+def _placeholder_klare_data():
+    return {
+        "day_pass": False,
+        "basic_pass": False,
+        "premium_pass": False,
+        "easy_beaten": [],
+        "medium_beaten": [],
+        "hard_beaten": [],
+        "easy_pro_beaten": False,
+        "medium_pro_beaten": False,
+        "hard_pro_beaten": False,
+    }
+
+# Help menu
+def help_menu():
+    while True:
+        press_to_continue()
+        clear_cmd()
+        print("===== LIAR'S DICE - HELP MENU =====\n")
+
+        print("=== OBJECTIVE ===")
+        print("The goal of Liar’s Dice is to outlast every other player by making accurate bids or calling out false ones. "
+              "Each player secretly rolls dice, and on their turn they must either RAISE the current bid or CALL BLUFF. "
+              "When a bluff is called, all dice are revealed and one player is eliminated.\n")
+
+        print("=== BASIC TERMS ===")
+        print("• Bid: A claim about how many dice of a specific face value exist across ALL players (e.g. '3 4's' means at least 3 dice show a 4).")
+        print("• Raise: Increasing the current bid. You must either increase the quantity or raise the face while keeping the quantity the same.")
+        print("• Caller: The player who chooses to call bluff on the current bidder’s claim.")
+        print("• Current Bidder: The player who made the most recent bid.")
+        print("• Round: A cycle of bidding and bluff-calling that ends when one player is eliminated.\n")
+
+        print("=== TURN ORDER DISPLAY ===")
+        print("At the start of each round, you’ll see a list of players in order of turns. "
+              "The active player’s name is highlighted in green. As players are eliminated, they disappear from the list. "
+              "Turn order rotates automatically each round, beginning with the player after whoever last called a bluff.\n")
+
+        print("=== HOW TO MAKE A LEGAL BID ===")
+        print("On your turn, you can choose to [1] Up Bid or [2] Call Bluff.\n")
+        print("When choosing to Up Bid, you must type two numbers separated by a space, for example:")
+        print("    4 5")
+        print("This means you are claiming there are at least 4 dice showing a face of 5 across the entire table.\n")
+        print("A bid is only LEGAL if it increases the total quantity or, if the quantity stays the same, raises the face value.\n")
+        print("Examples of LEGAL raises:")
+        print("• From '3 4' to '4 4'  (quantity increased)")
+        print("• From '4 4' to '4 5'  (face increased)")
+        print("Examples of ILLEGAL raises:")
+        print("• From '3 4' to '3 1'  (face decreased)")
+        print("• From '4 4' to '3 6'  (quantity decreased)\n")
+
+        print("=== CALLING A BLUFF ===")
+        print("If you think the current bid is false, choose to Call Bluff. "
+              "All dice are revealed and compared to the claim.\n")
+        print("• If the bid was TRUE (enough dice matched), the CALLER is eliminated.")
+        print("• If the bid was FALSE (not enough dice), the BIDDER is eliminated.\n")
+        print("There are no retries or second chances... once eliminated, you are out of the match.\n")
+        print("Optional rule: if you pick 'lose one die per challenge' when starting a match, the loser of a call "
+              "gives up one die instead, and is only out once their last die is gone.\n")
+        print("Optional rule: with ones wild, every 1 rolled also counts towards bids on any other face.\n")
+        print("Optional rule: with spot-on calls, choose [3] Spot On to claim the bid is EXACTLY right. "
+              "If it is, the bidder loses the challenge; if there are more or fewer, you do.\n")
+
+        print("=== PARTNERS ===")
+        print("Depending on the number of players, you may have one or more partners. "
+              "Your partner’s dice will be visible to you each round while they are still in the game.\n")
+        print("• 2–17 players: 1 partner (2 winners total)\n"
+              "• 18–31 players: 2 partners (3 winners total, 34/33/33 gold split)\n"
+              "• 32+ players: 3 partners (4 winners total, 25% each)\n")
+        print("If you and your partner(s) are among the last survivors, you share the gold rewards. "
+              "If you and a single partner are the final two, the split is 75% for you, 25% for your partner.\n")
+
+        print("=== GOLD, BETS, AND REWARDS ===")
+        print("Each player adds gold into a shared pot at the start of a match. "
+              "When the game ends, survivors split the pot according to player count:\n"
+              "• 2 survivors: 50/50, or 75/25 if Knight + partner.\n"
+              "• 3 survivors: 34/33/33.\n"
+              "• 4 survivors: 25% each.\n")
+        print("If you are eliminated before the end, your gold is lost.\n")
+
+        print("=== AI DIFFICULTY ===")
+        print("The AI behaves differently at each difficulty level:\n"
+              "• Easy: Plays cautiously, rarely uses partner dice in bidding, and avoids calls.\n"
+              "• Medium: Considers partner dice sometimes, mixes confidence and caution.\n"
+              "• Hard: Always calculates with partner dice, adapts using stored memory from previous games, "
+              "and uses accurate probability for its decisions.\n")
+
+        print("=== MATCH FLOW ===")
+        print("1. All players roll dice.\n"
+              "2. Starting player makes the first bid.\n"
+              "3. Each player either raises the bid or calls bluff.\n"
+              "4. When a bluff is called, dice are revealed and one player is eliminated.\n"
+              "5. The person after the caller starts the next round.\n"
+              "6. The game continues until the required number of survivors remain.\n")
+
+        print("=== ELIMINATION AND ENDGAME ===")
+        print("When you are called out correctly (your bid was false), you are eliminated immediately with no chance to continue. "
+              "If your call was correct, the bidder is eliminated instead.\n")
+        print("The match ends once the survivor count matches the number of winners for that player range (2, 3, or 4). "
+              "Gold rewards are then distributed automatically according to the final survivor group.\n")
+
+        print("=== QUICK REMINDERS ===")
+        print("• Enter bids as two numbers: quantity then face (e.g., 3 5).\n"
+              "• You cannot lower a bid’s quantity or face value.\n"
+              "• You can always call bluff instead of raising.\n"
+              "• The active player is highlighted in green at the top of the screen.\n"
+              "• Eliminated players are permanently out — no respawns, no retries.\n")
+
+        print("=====================================")
+        print("Press Enter to return.")
+        input("Enter: ").strip().lower()
+        break  
+
+# Update log
+def updatelog():
+    clear_cmd()
+    Print("-----Current Version: V2-----")
+    print("- Added standalone menu with Rules, Update Log, and Play options.")
+    print("- Expanded player scaling beyond 8 participants; supports 2–32+ players.")
+    print("- Added dynamic partner system:")
+    print("   • 2–17 players → 1 partner, 2 total winners (50/50 or 75/25 split).")
+    print("   • 18–31 players → 2 partners, 3 total winners (34/33/33 split).")
+    print("   • 32+ players → 3 partners, 4 total winners (25% each).")
+    print("- Introduced new probability balancing for large-table realism; AIs avoid early impossible calls.")
+    print("- Added persistent AI memory saving to external JSON file (auto-saves during play).")
+    print("- New difficulty tuning:")
+    print("   • Easy: simplified reasoning, slower adaptation.")
+    print("   • Medium: balanced confidence and partner use.")
+    print("   • Hard: full probabilistic reasoning using partner dice and memory.")
+    print("- Reworked turn pacing and AI noise gate for faster performance at 15+ players.")
+    print("- Improved reveal and dice printing for large matches (fast print mode).")
+    print("- Added post-elimination option to skip or watch remaining rounds.")
+    print("- Integrated `klare_data` tracking for which AI names you've beaten by difficulty.")
+    print("- Added structured gold payout system with dynamic split rules and proper rounding.")
+    print("- Improved probability helper for more accurate bluff analysis.")
+    print("- Rewrote partner assignment to ensure even distribution across large tables.")
+    print("- Added emergent AI behaviors that evolve via saved statistics between sessions.")
+    print("\n---Bugs/Changes---")
+    print("- Fixed edge cases where bids could exceed total dice count.")
+    print("- Fixed partner dice not counting properly on some AI difficulties.")
+    print("- Fixed saved memory overwriting on corrupted files.")
+    print("- Fixed crash when AI_MEMORY_FILE missing or malformed.")
+    print("- Improved stability when the Knight is eliminated early.")
+    print("- Adjusted AI call thresholds to prevent overly-aggressive play at large tables.")
+    print("- Adjusted output pacing and formatting for better readability.")
+    print("- Refined elimination order tracking and end-of-game summaries.")
+
+# Standalone menu: show it straight away, load saved state behind it
+def main_menu():
+    ledger_preload = _Preload(Ledger)
+    ledger = None
+    while True:
+        preload_ai_memory()
+        print("\nLIAR'S DICE – Standalone")
+        print("[1] Play")
+        print("[2] Rules")
+        print("[3] Update Log")
+        print("[4] Quit")
+        choice = input("Enter: ").strip()
+        if choice == "2":
+            help_menu()
+            clear_cmd()
+            continue
+        if choice == "3":
+            updatelog()
+            press_to_continue()
+            clear_cmd()
+            continue
+        if choice == "4":
+            ledger = ledger or ledger_preload.result()
+            if ledger is not None:
+                ledger.close()
+            return 0
+        if choice != "1":
+            print("Invalid choice.")
+            continue
+
+        if ledger is None:
+            ledger = ledger_preload.result() or Ledger()
+
+        if os.path.exists(MATCH_CHECKPOINT_FILE) and MatchCheckpoint.load(MATCH_CHECKPOINT_FILE) is None:
+            Print("\nYour unfinished match was saved by an older version or is damaged and can't be resumed.")
+            MatchCheckpoint(MATCH_CHECKPOINT_FILE).clear()
+        if os.path.exists(MATCH_CHECKPOINT_FILE):
+            if input("Resume your unfinished match? [y/n]: ").strip().lower().startswith("y"):
+                player_data = {"gold": ledger.gold("Knight")}
+                klare_data = _placeholder_klare_data()
+                for key in BEATEN_KEYS:
+                    klare_data[key] = list(ledger.account("Knight").get(key, []))
+                player_data, klare_data = play_liars_dice(player_data, klare_data, 0, None, None, ledger=ledger,
+                                                          checkpoint=MATCH_CHECKPOINT_FILE, resume=True)
+                Print(f"\nFinal gold: {player_data.get('gold', 0)}")
+                continue
+            MatchCheckpoint(MATCH_CHECKPOINT_FILE).clear()
+        player_data = {"gold": ledger.gold("Knight")}
+        klare_data = _placeholder_klare_data()
+        for key in BEATEN_KEYS:
+            klare_data[key] = list(ledger.account("Knight").get(key, []))
+
+        try:
+            enemy_count = int(input("How many opponents? ").strip())
+        except ValueError:
+            enemy_count = 7
+
+        difficulty = input("Difficulty [easy/medium/hard]: ").strip().lower() or "medium"
+        dice_loss = input("Lose one die per challenge instead of being out? [y/N]: ").strip().lower().startswith("y")
+        wild_ones = input("Ones are wild? [y/N]: ").strip().lower().startswith("y")
+        spot_on = input("Allow spot-on calls? [y/N]: ").strip().lower().startswith("y")
+        try:
+            gold_bet = int(input("Gold bet per player: ").strip())
+        except ValueError:
+            gold_bet = 50
+        broadcast = input("Broadcast this match to local viewers? [y/N]: ").strip().lower().startswith("y")
+
+        default_names = ["Joe", "Bob", "Frank", "Sue", "Tom", "Lily", "Max", "Emma", "Nia", "Zed", "Kara", "Vince",
+                         "Mira", "Ike", "Tess", "Odin", "Quinn", "Rhea", "Pax", "Uma", "Xan", "Yuri"]
+        enemy_names = default_names[:enemy_count]
+
+        Print(f"\nYou will play Liar's Dice against {enemy_count} opponents for {gold_bet} gold each.\n")
+        bus = caster = None
+        if broadcast:
+            from .broadcast import Broadcaster
+            try:
+                caster = Broadcaster()
+            except OSError:
+                Print("The broadcast port is busy, playing without viewers.")
+            else:
+                bus = EventBus()
+                caster.attach(bus)
+                Print(f"Viewers can join with: python liarsdice.py watch --port {caster.address[1]}")
+        try:
+            player_data, klare_data = play_liars_dice(player_data, klare_data, enemy_count, difficulty, enemy_names,
+                                                      gold_bet, ledger=ledger, checkpoint=MATCH_CHECKPOINT_FILE,
+                                                      rules=make_rules(dice_loss=dice_loss, wild_ones=wild_ones,
+                                                                       spot_on=spot_on), events=bus)
+        finally:
+            if caster is not None:
+                caster.close()
+
+        Print(f"\nFinal gold: {player_data.get('gold', 0)}")
+        Print(f"Beaten lists: easy={klare_data['easy_beaten']}, medium={klare_data['medium_beaten']}, hard={klare_data['hard_beaten']}")
@@ -0,0 +1,72 @@
+"""
+AI memory file: the retention policy, and concurrent saves merging instead of
+overwriting each other. Run from the repo root with `python -m pytest`.
+"""
+import threading
+
+import pytest
+
+from liars_dice import persistence
+from liars_dice.persistence import _read_ai_memory_file, compact_ai_memory, load_ai_memory, save_ai_memory
+
+def test_negative_counter_cap_decays_to_zero():
+    data = {"A": {"bluffs_made": 5, "truths_made": 3}}
+    assert compact_ai_memory(data, {"A": 100}, now=100, counter_cap=-1) == (0, 1)
+    assert data == {"A": {"bluffs_made": 0, "truths_made": 0}}
+
+def test_negative_limits_count_as_zero():
+    data = {"A": {"bluffs_made": 1}, "B": {"bluffs_made": 1}}
+    last_seen = {"A": 100, "B": 50}
+    assert compact_ai_memory(data, last_seen, now=100, retention_days=-1, max_identities=-3, keep=("A",)) == (1, 0)
+    assert list(data) == ["A"] and last_seen == {"A": 100}
+
+@pytest.fixture
+def memory_file(tmp_path, monkeypatch):
+    path = str(tmp_path / "ai_memory.json")
+    monkeypatch.setattr(persistence, "AI_MEMORY_FILE", path)
+    return path
+
+def test_two_processes_keep_each_others_updates(memory_file):
+    seed = load_ai_memory(["A"])
+    seed["A"]["bluffs_made"] = 10
+    save_ai_memory(seed)
+
+    first = load_ai_memory(["A", "B"])
+    second = load_ai_memory(["A", "C"])
+    first["A"]["bluffs_made"] += 2
+    first["B"]["truths_made"] += 1
+    second["A"]["bluffs_made"] += 3
+    second["A"]["truth_success"] += 1
+    second["C"]["bluffs_caught"] += 4
+    save_ai_memory(first)
+    save_ai_memory(second)
+    # nothing new since the last sync: saving again adds nothing
+    save_ai_memory(first)
+
+    on_disk = _read_ai_memory_file()
+    assert on_disk["A"]["bluffs_made"] == 15
+    assert on_disk["A"]["truth_success"] == 1
+    assert on_disk["B"]["truths_made"] == 1
+    assert on_disk["C"]["bluffs_caught"] == 4
+    # the later saver is refreshed with the earlier one's changes
+    assert second["B"]["truths_made"] == 1 and second["A"]["bluffs_made"] == 15
+
+def test_concurrent_saves_lose_nothing(memory_file):
+    rounds = 20
+
+    def play(name):
+        memory = load_ai_memory(["shared", name])
+        for _ in range(rounds):
+            memory["shared"]["bluffs_made"] += 1
+            memory[name]["truths_made"] += 1
+            save_ai_memory(memory)
+
+    threads = [threading.Thread(target=play, args=(f"seat{i}",)) for i in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    on_disk = _read_ai_memory_file()
+    assert on_disk["shared"]["bluffs_made"] == 2 * rounds
+    assert on_disk["seat0"]["truths_made"] == on_disk["seat1"]["truths_made"] == rounds
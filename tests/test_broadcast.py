@@ -0,0 +1,31 @@
+"""
+Broadcast mode: a viewer receives every frame of a match, in order.
+"""
+import json
+import random
+import socket
+import time
+
+from liars_dice.broadcast import Broadcaster, event_frame
+from liars_dice.engine import MATCH_EVENTS, EventBus
+from liars_dice.simulate import _mixed_seats, simulate_match
+
+def test_viewer_gets_every_frame_in_order():
+    caster = Broadcaster(port=0)
+    try:
+        viewer = socket.create_connection(caster.address)
+        while caster.stats()["viewers"] == 0:
+            time.sleep(0.01)
+        bus = EventBus()
+        caster.attach(bus)
+        sent = []
+        for event_type in MATCH_EVENTS:
+            bus.subscribe(event_type, lambda ev: sent.append(event_frame(ev)))
+        simulate_match(_mixed_seats(6), rng=random.Random(3), gold_bet=10, events=bus)
+        assert caster.stats() == {"viewers": 1, "frames": len(sent), "dropped": 0}
+    finally:
+        caster.close()
+    with viewer, viewer.makefile("rb") as stream:
+        received = stream.readlines()
+    assert received == sent
+    assert json.loads(received[-1])["type"] == "MatchEnded"
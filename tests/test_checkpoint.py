@@ -0,0 +1,103 @@
+"""
+Match checkpoints: the begin / save / load round trip, resuming a match that was
+cut off a few rounds in, and refusing to resume from a missing or unreadable
+snapshot. Run from the repo root with `python -m pytest`.
+"""
+import random
+import time
+from collections import deque
+
+import pytest
+
+from liars_dice import persistence
+from liars_dice.ai import RoundAI
+from liars_dice.engine import SeatStats, make_rules
+from liars_dice.persistence import Ledger, MatchCheckpoint
+from liars_dice.ui import _placeholder_klare_data, play_liars_dice
+
+PLAYERS = ["Knight", "A", "B", "C", "D"]
+PARTNERS = {"Knight": ["B"], "B": ["Knight"], "A": [], "C": ["D"], "D": ["C"]}
+RULES = make_rules(dice_per_player=3, dice_loss=True, wild_ones=True)
+
+@pytest.fixture(autouse=True)
+def in_tmp(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(persistence, "AI_MEMORY_FILE", str(tmp_path / "ai_memory.json"))
+    # silent play still types out the turn order
+    monkeypatch.setattr(time, "sleep", lambda seconds: None)
+
+def test_round_trip():
+    saver = MatchCheckpoint("cp.json")
+    saver.begin(PLAYERS, PARTNERS, 1, 2, [50, 50], 10, 50, "hard", "m1", RULES)
+    active = {"Knight": [1, 6], "A": [2, 2, 5], "C": [4]}
+    dice_counts = {"Knight": 2, "A": 3, "C": 1}
+    memory = SeatStats(PLAYERS)
+    memory.add("A", ("bluffs_made", "bluff_success"))
+    memory.add("C", ("truths_made",))
+    saver.save(active, deque(["C", "Knight", "A"]), ["D", "B"], "A", 2, 17, memory, {"D"}, dice_counts)
+
+    snap = MatchCheckpoint.load("cp.json")
+    assert snap["players"] == PLAYERS
+    assert snap["partners"] == PARTNERS
+    assert (snap["k_partners"], snap["max_winners"], snap["split_rule"]) == (1, 2, [50, 50])
+    assert (snap["gold_bet"], snap["pot"], snap["difficulty"], snap["match_id"]) == (10, 50, "hard", "m1")
+    assert snap["rules"] == RULES
+    assert snap["active_players"] == active
+    assert snap["dice_counts"] == dice_counts
+    assert list(snap["turn_order"]) == ["C", "Knight", "A"]
+    assert snap["elimination_order"] == ["D", "B"]
+    assert snap["next_round_starter_name"] == "A"
+    assert (snap["round_start_index"], snap["turn_counter"]) == (2, 17)
+    assert dict(snap["match_memory"].items()) == dict(memory.items())
+    assert snap["beaten"] == {"D"}
+
+    saver.clear()
+    assert MatchCheckpoint.load("cp.json") is None
+
+def test_resume_after_a_few_rounds(monkeypatch):
+    random.seed(7)
+    ledger = Ledger("ledger.json", "ledger.journal", fsync=False)
+    names = [f"AI {i}" for i in range(8)]
+    start_gold = ledger.gold("Knight")
+
+    turn = RoundAI.turn
+    turns = []
+    def cut_off(self, *args):
+        turns.append(args[0])
+        if len(turns) == 30:
+            raise KeyboardInterrupt
+        return turn(self, *args)
+    monkeypatch.setattr(RoundAI, "turn", cut_off)
+    with pytest.raises(KeyboardInterrupt):
+        play_liars_dice({"gold": start_gold}, _placeholder_klare_data(), 8, "medium", names, gold_bet=10,
+                        silent=True, ledger=ledger, checkpoint="cp.json", rules=RULES)
+    monkeypatch.setattr(RoundAI, "turn", turn)
+
+    snap = MatchCheckpoint.load("cp.json")
+    assert snap is not None
+    assert snap["turn_counter"] > 0
+    assert sum(snap["dice_counts"].values()) < len(names + ["Knight"]) * RULES["dice_per_player"]
+    assert ledger.gold("Knight") == start_gold - 10
+
+    player_data, _ = play_liars_dice({"gold": ledger.gold("Knight")}, _placeholder_klare_data(), 0, None, None,
+                                     silent=True, ledger=ledger, checkpoint="cp.json", resume=True)
+    assert MatchCheckpoint.load("cp.json") is None
+    # the ante was taken once, and the whole pot went out to the survivors
+    assert player_data["gold"] == ledger.gold("Knight")
+    assert sum(a["gold"] for a in ledger.accounts.values()) == len(ledger.accounts) * persistence.STARTING_GOLD
+    assert ledger.account("Knight")["bets"] == 1
+    ledger.close()
+
+@pytest.mark.parametrize("contents", [None, "", '{"version":1,"players":["Knight"', "not json"])
+def test_resume_without_a_readable_snapshot_plays_nothing(contents):
+    if contents is not None:
+        with open("cp.json", "w", encoding="utf-8") as f:
+            f.write(contents)
+    ledger = Ledger("ledger.json", "ledger.journal", fsync=False)
+    player_data, klare_data = {"gold": 300}, _placeholder_klare_data()
+    assert MatchCheckpoint.load("cp.json") is None
+    result = play_liars_dice(player_data, klare_data, 0, None, None, silent=True, ledger=ledger,
+                             checkpoint="cp.json", resume=True)
+    assert result == (player_data, klare_data) and player_data == {"gold": 300}
+    assert ledger.seq == 0
+    ledger.close()
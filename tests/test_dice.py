@@ -0,0 +1,49 @@
+"""
+_roll_all takes the stock generator's bits directly instead of calling randint;
+these pin that it still rolls exactly what rng.randint(1, 6) would.
+"""
+import random
+
+import pytest
+
+from liars_dice.engine import _roll_all, _stock_d6_bits
+
+def _table(seats, dice):
+    return {f"P{i}": [] for i in range(seats)}, {f"P{i}": dice for i in range(seats)}
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_randint_draw_for_draw(seed):
+    players, counts = _table(50, 5)
+    fast, slow = random.Random(seed), random.Random(seed)
+    totals = _roll_all(players, counts, fast)
+    expected = {name: [slow.randint(1, 6) for _ in range(n)] for name, n in counts.items()}
+    assert players == expected
+    assert totals == [0] + [sum(d.count(f) for d in expected.values()) for f in range(1, 7)]
+    assert fast.getstate() == slow.getstate()
+
+def test_module_level_rng_matches_randint():
+    players, counts = _table(10, 4)
+    random.seed(7)
+    _roll_all(players, counts)
+    after_fast = random.getstate()
+    random.seed(7)
+    expected = {name: [random.randint(1, 6) for _ in range(n)] for name, n in counts.items()}
+    assert players == expected
+    assert random.getstate() == after_fast
+
+class LoadedRandom(random.Random):
+    """Overrides random() only, like a subclass that plugs in its own source."""
+    def random(self):
+        return 0.0
+
+def test_subclasses_keep_their_own_randint():
+    assert _stock_d6_bits(random.Random()) is not None
+    assert _stock_d6_bits(random.SystemRandom()) is None
+    assert _stock_d6_bits(LoadedRandom()) is None
+
+    class Sixes(random.Random):
+        def randint(self, a, b):
+            return b
+    players, counts = _table(3, 4)
+    assert _roll_all(players, counts, Sixes(1))[6] == 12
+    assert all(d == [6, 6, 6, 6] for d in players.values())
@@ -0,0 +1,79 @@
+"""
+Ledger crash recovery: replaying the journal after a torn last line, and after
+a snapshot the journal was not yet emptied for. Run from the repo root with
+`python -m pytest`.
+"""
+import pytest
+
+from liars_dice.persistence import STARTING_GOLD, Ledger
+
+@pytest.fixture
+def paths(tmp_path):
+    return str(tmp_path / "ledger.json"), str(tmp_path / "ledger.journal")
+
+def _open(paths, compact_every=500):
+    return Ledger(*paths, compact_every=compact_every, fsync=False)
+
+def _play(ledger):
+    ledger.bet("Knight", 50, match="m1")
+    ledger.payout("Knight", 120, match="m1")
+    ledger.beaten("Knight", "easy_beaten", "Klare")
+
+@pytest.mark.parametrize("tail", ['{"seq":4,"op":"bet","name":"Kni', '{"seq":4,"op":"bet","name":"Knight","amount":70}'])
+def test_torn_last_line_is_dropped(paths, tail):
+    ledger = _open(paths)
+    _play(ledger)
+    ledger.close()
+    with open(paths[1], "a", encoding="utf-8") as f:
+        f.write(tail)
+
+    ledger = _open(paths)
+    assert ledger.seq == 3
+    assert ledger.gold("Knight") == STARTING_GOLD + 70
+    assert ledger.account("Knight")["easy_beaten"] == ["Klare"]
+    # the next entry starts on a clean line and survives another reload
+    ledger.bet("Knight", 10)
+    ledger.close()
+    ledger = _open(paths)
+    assert ledger.seq == 4
+    assert ledger.gold("Knight") == STARTING_GOLD + 60
+    ledger.close()
+
+def test_compaction_replays_each_entry_once(paths):
+    ledger = _open(paths, compact_every=2)
+    _play(ledger)
+    ledger.bet("Klare", 30)
+    ledger.close()
+    with open(paths[1], encoding="utf-8") as f:
+        assert len(f.readlines()) == 0
+
+    ledger = _open(paths, compact_every=2)
+    assert ledger.seq == 4
+    assert ledger.gold("Knight") == STARTING_GOLD + 70
+    assert ledger.gold("Klare") == STARTING_GOLD - 30
+    assert ledger.account("Knight")["bets"] == 1
+    ledger.close()
+
+def test_journal_left_behind_by_a_crashed_compaction_is_skipped(paths):
+    ledger = _open(paths)
+    _play(ledger)
+    with open(paths[1], "rb") as f:
+        journal = f.read()
+    # crash after the snapshot was renamed into place, before the journal was emptied
+    ledger.compact()
+    ledger.close()
+    with open(paths[1], "wb") as f:
+        f.write(journal)
+
+    ledger = _open(paths)
+    assert ledger.seq == 3
+    assert ledger.gold("Knight") == STARTING_GOLD + 70
+    assert ledger.account("Knight")["bets"] == 1
+    assert ledger.account("Knight")["payouts"] == 1
+    # entries after the snapshot still replay
+    ledger.bet("Knight", 5)
+    ledger.close()
+    ledger = _open(paths)
+    assert ledger.seq == 4
+    assert ledger.gold("Knight") == STARTING_GOLD + 65
+    ledger.close()
@@ -0,0 +1,70 @@
+"""
+Exhaustive checks of the payout engine: every pot up to MAX_POT, every group
+size, split rule, partner pairing and choice of lead. Run from the repo root
+with `python -m pytest`.
+"""
+import pytest
+
+from liars_dice.engine import compute_payouts, payout_rule
+
+MAX_POT = 400
+SPLIT_RULES = ([50, 50], [34, 33, 33], [25, 25, 25, 25])
+NAMES = ["Knight", "A", "B", "C", "D"]
+
+def _old_lead_share(pot, survivors, partners_map, split_rule, lead):
+    """What the lead was paid before the payout engine existed (the Knight's branch of play_liars_dice)."""
+    n = len(survivors)
+    if n == 2:
+        other = [s for s in survivors if s != lead][0]
+        if other in partners_map.get(lead, []):
+            return int(pot * 0.75)
+        return (pot * split_rule[0]) // 100 if split_rule == [50, 50] else pot // 2
+    if n == 3 and split_rule == [34, 33, 33]:
+        return (pot * 34) // 100
+    if n == 4 and split_rule == [25, 25, 25, 25]:
+        return (pot * 25) // 100
+    return pot // max(2, n)
+
+def _cases():
+    for split_rule in SPLIT_RULES:
+        for n in range(1, 6):
+            survivors = NAMES[:n]
+            for partnered in (False, True):
+                partners_map = {"Knight": ["A"], "A": ["Knight"]} if partnered else {}
+                for lead in survivors + ["Nobody", None]:
+                    yield split_rule, survivors, partners_map, lead
+
+CASES = list(_cases())
+# before the engine only a surviving lead in a group of two or more had a share
+LEAD_CASES = [c for c in CASES if c[3] in c[1] and len(c[1]) > 1]
+
+@pytest.mark.parametrize("split_rule,survivors,partners_map,lead", CASES)
+def test_pot_is_conserved(split_rule, survivors, partners_map, lead):
+    for pot in range(MAX_POT + 1):
+        paid = compute_payouts(pot, survivors, partners_map, split_rule, lead=lead)
+        assert sorted(paid) == sorted(survivors)
+        assert all(g >= 0 for g in paid.values())
+        assert sum(paid.values()) == pot
+
+@pytest.mark.parametrize("split_rule,survivors,partners_map,lead", LEAD_CASES)
+def test_lead_keeps_its_old_share(split_rule, survivors, partners_map, lead):
+    for pot in range(MAX_POT + 1):
+        paid = compute_payouts(pot, survivors, partners_map, split_rule, lead=lead)
+        assert paid[lead] == _old_lead_share(pot, survivors, partners_map, split_rule, lead)
+
+def test_lone_survivor_takes_the_pot():
+    for pot in range(MAX_POT + 1):
+        assert compute_payouts(pot, ["A"], {}, [50, 50], lead=None) == {"A": pot}
+
+def test_no_survivors_pays_nobody():
+    assert compute_payouts(100, [], {}, [50, 50]) == {}
+
+@pytest.mark.parametrize("split_rule", SPLIT_RULES)
+def test_rule_labels(split_rule):
+    partners_map = {"Knight": ["A"], "A": ["Knight"]}
+    assert payout_rule(["A", "Knight"], partners_map, split_rule)[:2] == ("75/25", ["Knight", "A"])
+    label, ranked, percents = payout_rule(NAMES[:len(split_rule)], {}, split_rule, lead=None)
+    assert ranked == NAMES[:len(split_rule)]
+    assert percents == tuple(split_rule)
+    assert label == {2: "50/50", 3: "34/33/33", 4: "25x4"}[len(split_rule)]
+    assert payout_rule(NAMES, {}, split_rule) == ("even", NAMES, None)
@@ -0,0 +1,59 @@
+"""
+RoundAI reuses each seat's view for a whole round; these pin that its turns
+decide exactly what ai_take_turn decides from scratch, draw for draw.
+"""
+import copy
+import random
+
+import pytest
+
+from liars_dice.ai import AI_PARAMS, HeuristicPolicy, OpponentModel, RoundAI, ai_take_turn
+from liars_dice.engine import BASE_STATS, RoundHands, _roll_all, assign_partners, make_rules
+
+RULE_SETS = [make_rules(), make_rules(dice_loss=True, wild_ones=True), make_rules(dice_per_player=5, spot_on=True),
+             make_rules(dice_per_player=2, wild_ones=True, spot_on=True)]
+
+def _table(seed, rules):
+    rng = random.Random(seed)
+    names = [f"AI {i}" for i in range(rng.randint(2, 14))]
+    partners = assign_partners(names, rng=rng)[0]
+    dice_counts = {name: rng.randint(1, rules["dice_per_player"]) for name in names}
+    active_players = {name: [] for name in names}
+    _roll_all(active_players, dice_counts, rng)
+    global_memory = {name: {k: rng.randint(0, 30) for k in BASE_STATS} for name in names}
+    model = OpponentModel()
+    for _ in range(40):
+        observer, opponent = rng.sample(names, 2)
+        model.observe(observer, opponent, global_memory, bluffed=rng.random() < 0.4,
+                      bluff_succeeded=rng.random() < 0.5)
+    difficulty = {name: rng.choice(list(AI_PARAMS)) for name in names}
+    return names, partners, active_players, global_memory, model, difficulty
+
+@pytest.mark.parametrize("rules", RULE_SETS)
+@pytest.mark.parametrize("seed", range(15))
+def test_round_ai_matches_ai_take_turn(seed, rules):
+    names, partners, active_players, global_memory, model, difficulty = _table(seed, rules)
+    policies = {d: HeuristicPolicy(d) for d in AI_PARAMS}
+    total_dice = sum(len(d) for d in active_players.values())
+
+    old_rng, new_rng = random.Random(seed), random.Random(seed)
+    old_memory, new_memory = global_memory, copy.deepcopy(global_memory)
+    old_model, new_model = model, copy.deepcopy(model)
+    round_ai = RoundAI(RoundHands(active_players, partners, rules), total_dice, partners, new_memory, new_model,
+                       new_rng, rules)
+
+    current_bid = current_bidder = None
+    for turn in range(3 * len(names)):
+        player = names[turn % len(names)]
+        policy = policies[difficulty[player]]
+        expected = ai_take_turn(player, active_players, partners, current_bid, current_bidder, old_memory,
+                                difficulty[player], opponent_model=old_model, quiet=True, rng=old_rng, policy=policy,
+                                rules=rules)
+        got = round_ai.turn(player, policy, current_bid, current_bidder)
+        assert got == expected
+        assert new_rng.getstate() == old_rng.getstate()
+        # a call would end the round; the next seat is asked about the same bid instead,
+        # so every seat acts more than once on its reused view
+        bid, bidder, wants_reveal, _ = got
+        if not wants_reveal:
+            current_bid, current_bidder = bid, bidder